@@ -1,14 +1,17 @@
+import os.path
+import time
 from contextlib import contextmanager
-from queue import Queue
 
 from nicegui import ui, run
 from nicegui.events import ClickEventArguments
 
 import version
 from data.model import Model
+from data.snapshot import InvalidSnapshot, SNAPSHOT_FILE, load_snapshot, save_snapshot
 from log_config import logger
 from messaging.console_print_listener import ConsolePrintListener
 from messaging.infolog_listener import InfoLogListener
+from messaging.progress import ProgressEvent
 from messaging.ui_notify_listener import QueueListener
 from reader.gw2api import GW2Api, InvalidAccessToken, MissingPermission, UserAborted
 from ui.advice.advice_craft_ui import AdviceCraftUi
@@ -24,6 +27,7 @@ from ui.advice.advice_rare_salvage_ui import AdviceRareSalvageUi
 from ui.advice.advice_stacks_ui import AdviceStacksUi
 from ui.advice.advice_vendor_ui import AdviceVendorUi
 from ui.api_keys_manager import ApiKeysManagerUi
+from ui.load_report_ui import load_report_ui
 from ui.ui_model import UiModel
 
 
@@ -40,6 +44,10 @@ async def start_advice(arg: ClickEventArguments) -> None:
     with disable(ui_model.start_button):
         try:
             ui_model.busy_spinner.set_visibility(True)
+            ui_model.progress_bar.set_value(0)
+            ui_model.progress_label.set_text('')
+            ui_model.progress.set_visibility(True)
+            previous_model = ui_model.model
             ui_model.model = None
             ui_model.clear_ui()
 
@@ -48,17 +56,31 @@ async def start_advice(arg: ClickEventArguments) -> None:
             elif ui_model.api_keys.selected_count == 0:
                 ui.notify("No api keys selected in list.", type='negative')
             else:
-                api_keys = []
-                for item in ui_model.api_keys.items:
-                    if item.selected:
-                        api_keys.append(GW2Api(item.api_key))
-                ui_model.model = Model(api_keys, ui_model.model_messaging)
-                ui.notify("Starting to load account data.", type='positive')
-                logger.info("Starting to load account data.")
+                selected_keys = [item.api_key for item in ui_model.api_keys.items if item.selected]
                 ui_model.abort_button.set_visibility(True)
-                await run.io_bound(ui_model.model.init_from_api)
+                if previous_model and [api.api_key for api in previous_model.apis] == selected_keys \
+                        and previous_model.can_refresh():
+                    # same accounts as last time, only what changed since is loaded
+                    ui_model.model = previous_model
+                    ui.notify("Refreshing account data.", type='positive')
+                    logger.info("Refreshing account data.")
+                    await run.io_bound(ui_model.model.refresh_from_api)
+                else:
+                    if previous_model:
+                        previous_model.close()
+                    api_keys = []
+                    for api_key in selected_keys:
+                        api_keys.append(GW2Api(api_key))
+                    ui_model.model = Model(api_keys, ui_model.model_messaging)
+                    ui.notify("Starting to load account data.", type='positive')
+                    logger.info("Starting to load account data.")
+                    await run.io_bound(ui_model.model.init_from_api)
                 ui.notify("Account data loaded.", type='positive')
                 logger.info("Account data loaded.")
+                try:
+                    await run.io_bound(save_snapshot, ui_model.model)
+                except OSError as ex:
+                    logger.error(f'Snapshot {SNAPSHOT_FILE} was not saved, error: ({ex})')
         except InvalidAccessToken as iat:
             ui.notify("API key is invalid!", type='negative')
             logger.warning(f"Invalid api key {iat.api_key}")
@@ -73,11 +95,53 @@ async def start_advice(arg: ClickEventArguments) -> None:
     ui_model.refresh_ui()
     ui_model.abort_button.set_visibility(False)
     ui_model.busy_spinner.set_visibility(False)
+    ui_model.progress.set_visibility(False)
 
 
-def notify_from_queue(queue: Queue) -> None:
-    while not queue.empty():
-        ui.notify(queue.get())
+def restore_snapshot() -> None:
+    if not os.path.isfile(SNAPSHOT_FILE):
+        return
+    model = Model([], ui_model.model_messaging)
+    try:
+        created = load_snapshot(model)
+        ui_model.model = model
+        ui_model.model_messaging.broadcast(
+            f"Showing advice from last load at {time.strftime('%Y-%m-%d %H:%M', time.localtime(created))}")
+    except InvalidSnapshot as ex:
+        logger.warning(f'Snapshot {ex.file_name} can not be used: {ex.reason}')
+
+
+def show_load_report() -> None:
+    if ui_model.model and ui_model.model.load_report:
+        load_report_ui(ui_model.model.load_report)
+    else:
+        ui.notify("No account data loaded yet.", type='warning')
+
+
+def show_progress(event: ProgressEvent) -> None:
+    if event.stage == 'load':
+        ui_model.progress_bar.set_value(event.fraction)
+    else:
+        ui_model.progress_label.set_text(event.message)
+
+
+def show_messages(messages: list) -> None:
+    notifications = []
+    for message in messages:
+        if isinstance(message, ProgressEvent):
+            show_progress(message)
+        else:
+            notifications.append(message)
+    # burst of messages is shown as one notification
+    if len(notifications) == 1:
+        ui.notify(notifications[0])
+    elif notifications:
+        ui.notify('\n'.join(notifications), multi_line=True, classes='whitespace-pre-line')
+
+
+def refresh_ready_advice(panels: list) -> None:
+    for panel in dict.fromkeys(panels):
+        panel.refresh_ui()
 
 
 @ui.page('/')
@@ -88,7 +152,8 @@ def index() -> None:
         '<link type="text/css" rel="stylesheet" href="https://d1h9a8s8eodvjz.cloudfront.net/fonts/menomonia/08-02-12/menomonia.css" />')
     ui.add_css('* { font-family: Menomonia; }')
 
-    ui.timer(0.1, callback=lambda: notify_from_queue(ui_model.queue))
+    ui_model.queue.connect(ui.context.client, show_messages)
+    ui_model.ready_advice.connect(ui.context.client, refresh_ready_advice)
 
     with ui.header(elevated=True):
         with ui.row():
@@ -103,11 +168,18 @@ def index() -> None:
                     'bg-green')
             ui_model.busy_spinner = ui.spinner('dots', size='lg', color='red')
             ui_model.busy_spinner.set_visibility(False)
+            with ui.column().classes('gap-0') as ui_model.progress:
+                ui_model.progress_bar = ui.linear_progress(value=0, show_value=False).props('color=white').classes(
+                    'w-64')
+                ui_model.progress_label = ui.label().classes('text-xs')
+            ui_model.progress.set_visibility(False)
             ui_model.abort_button = ui.button("Stop", icon='cancel').props('color=red-5').classes('shadow-lg').on_click(
                 ui_model.abort)
             ui_model.abort_button.set_visibility(False)
             with ui_model.abort_button:
                 ui.tooltip('Stop loading account info from API.').classes('bg-green')
+            with ui.button(icon='query_stats').props('flat color=white').on_click(show_load_report):
+                ui.tooltip('Timing of stages and API requests of last load.').classes('bg-green')
 
     ApiKeysManagerUi(ui_model)
 
@@ -142,6 +214,7 @@ if __name__ in {"__main__", "__mp_main__"}:
     ui_model.model_messaging.add_listener(ConsolePrintListener())
     ui_model.model_messaging.add_listener(InfoLogListener())
     ui_model.restore()
+    restore_snapshot()
 
     index()
 
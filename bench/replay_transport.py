@@ -0,0 +1,159 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlparse
+
+from requests.adapters import BaseAdapter
+from requests.models import PreparedRequest, Response
+
+from bench.synthetic import SyntheticWorld, ecto_item_id
+from reader.request_stats import endpoint_name
+
+build_id = 170000
+
+# page size used when caller does not ask for any
+default_page_size = 50
+
+
+class ReplayTransport(BaseAdapter):
+    # answers api requests from synthetic world, mount it instead of http adapter
+
+    def __init__(self, world: SyntheticWorld, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 seed: int = 1):
+        super().__init__()
+        self.world = world
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        # path -> count of requests and bytes served
+        self.requests: dict[str, int] = dict()
+        self.bytes: dict[str, int] = dict()
+        self.errors = 0
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        url = urlparse(request.url)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        path = url.path
+        with self.lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            failed = self.random.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay)
+
+        if failed:
+            status_code, data, headers = 503, {'text': 'ErrTimeout'}, dict()
+        else:
+            status_code, data, headers = self.route(path, query)
+
+        response = Response()
+        response.status_code = status_code
+        response.url = request.url
+        response.request = request
+        response.encoding = 'utf-8'
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        response.headers.update(headers)
+        response._content = json.dumps(data).encode('utf-8')
+        if status_code == 200:
+            etag = '"' + hashlib.md5(response._content).hexdigest() + '"'
+            response.headers['ETag'] = etag
+            if request.headers.get('If-None-Match', None) == etag:
+                response.status_code = 304
+                response._content = b''
+
+        with self.lock:
+            key = endpoint_name(path)
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self.bytes[key] = self.bytes.get(key, 0) + len(response._content)
+            if failed:
+                self.errors = self.errors + 1
+        return response
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {'requests': dict(self.requests), 'bytes': dict(self.bytes), 'errors': self.errors,
+                    'total_requests': sum(self.requests.values()), 'total_bytes': sum(self.bytes.values())}
+
+    def route(self, path: str, query: dict) -> tuple[int, object, dict]:
+        if path == '/v2/build':
+            return 200, {'id': build_id}, dict()
+        if path == '/v2/items':
+            return self.by_ids(self.world.items, query)
+        if path == '/v2/recipes':
+            if 'ids' in query:
+                return self.by_ids(self.world.recipes, query)
+            return 200, list(self.world.recipes.keys()), dict()
+        if path == '/v2/recipes/search':
+            return 200, self.world.recipes_by_ingredient.get(int(query.get('input', 0)), []), dict()
+        if path == '/v2/commerce/prices':
+            return self.by_ids({item_id: self.price(item_id) for item_id in self.ids(query)
+                                if item_id in self.world.items}, query)
+        if path.startswith('/v2/commerce/prices/'):
+            item_id = int(path.split('/')[4])
+            return (200, self.price(item_id), dict()) if item_id in self.world.items else self.not_found()
+
+        account = self.world.accounts.get(query.get('access_token', None), None)
+        if account is None:
+            return 401, {'text': 'Invalid access token'}, dict()
+        return self.route_account(account, path, query)
+
+    def route_account(self, account: dict, path: str, query: dict) -> tuple[int, object, dict]:
+        if path == '/v2/tokeninfo':
+            return 200, {'id': 'bench', 'name': 'bench', 'permissions': ['account', 'characters', 'inventories']}, \
+                dict()
+        if path == '/v2/account':
+            return 200, {'id': 'bench', 'name': account['name']}, dict()
+        if path == '/v2/account/materials':
+            return 200, account['materials'], dict()
+        if path == '/v2/account/bank':
+            return 200, account['bank'], dict()
+        if path == '/v2/account/inventory':
+            return 200, account['shared_slots'], dict()
+        if path == '/v2/characters':
+            characters = list(account['characters'].values())
+            if 'page' not in query:
+                return 200, [character['name'] for character in characters], dict()
+            page = int(query['page'])
+            page_size = int(query.get('page_size', default_page_size))
+            page_total = max(1, -(-len(characters) // page_size))
+            if page >= page_total:
+                return 400, {'text': 'page out of range'}, dict()
+            return 200, characters[page * page_size:(page + 1) * page_size], \
+                {'X-Page-Total': str(page_total), 'X-Page-Size': str(page_size),
+                 'X-Result-Total': str(len(characters))}
+        if path.startswith('/v2/characters/'):
+            parts = path.split('/')
+            character = account['characters'].get(unquote(parts[3]), None)
+            if character is None:
+                return self.not_found()
+            if len(parts) > 4 and parts[4] == 'core':
+                return 200, {key: value for key, value in character.items() if key != 'bags'}, dict()
+            if len(parts) > 4 and parts[4] == 'inventory':
+                return 200, {'bags': character['bags']}, dict()
+            return 200, character, dict()
+        return self.not_found()
+
+    @staticmethod
+    def ids(query: dict) -> list[int]:
+        return [int(entry_id) for entry_id in query.get('ids', '').split(',') if entry_id]
+
+    def by_ids(self, entries: dict, query: dict) -> tuple[int, object, dict]:
+        found = [entries[entry_id] for entry_id in self.ids(query) if entry_id in entries]
+        if not found:
+            return self.not_found()
+        return 200, found, dict()
+
+    def price(self, item_id: int) -> dict:
+        base = 30000 if item_id == ecto_item_id else item_id % 5000 + 10
+        return {'id': item_id, 'whitelisted': False, 'buys': {'quantity': 100, 'unit_price': base - 5},
+                'sells': {'quantity': 100, 'unit_price': base}}
+
+    @staticmethod
+    def not_found() -> tuple[int, object, dict]:
+        return 404, {'text': 'all ids provided are invalid'}, dict()
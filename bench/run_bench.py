@@ -0,0 +1,241 @@
+import argparse
+import copy
+import json
+import platform
+import random
+import statistics
+import time
+from dataclasses import asdict
+
+from bench.replay_transport import ReplayTransport
+from bench.synthetic import SyntheticConfig, SyntheticWorld
+from data.advice_cache import AdviceCache
+from data.advice_engine import AdviceEngine
+from data.model import Model
+from messaging.messaging import Messaging
+from reader.catalog_cache import CatalogCache
+from reader.gw2api import GW2Api
+from reader.gw2catalog import GW2Catalog
+from reader.rate_limiter import RateLimiter
+from reader.response_cache import ResponseCache
+
+BENCH_REPORT_FILE = 'bench_report.json'
+
+report_version = 2
+
+# model getters of advice, as called by advice panels
+advice_getters = ['get_advice_stacks', 'get_vendor_advice', 'get_rare_salvage_advice', 'get_craft_luck_advice',
+                  'get_advice_just_delete', 'get_just_salvage_advice', 'get_play_to_consume_advice',
+                  'get_gobbler_advice', 'get_misc_advice', 'get_karma_consumables_advice', 'get_ls3ls4ibs_advice',
+                  'get_craft_advice']
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def new_model(world: SyntheticWorld, transport: ReplayTransport, limiter: RateLimiter, catalog: GW2Catalog) -> Model:
+    apis = [GW2Api(api_key, limiter=limiter, transport=transport) for api_key in world.accounts.keys()]
+    return Model(apis, Messaging(), catalog=catalog)
+
+
+def bench_load(world: SyntheticWorld, args: argparse.Namespace) -> tuple[Model, dict]:
+    transport = ReplayTransport(world, args.latency, args.jitter, args.error_rate, args.seed)
+    limiter = RateLimiter(args.rate, args.burst)
+    # every run starts with empty catalog caches, second load shows what caches save
+    catalog = GW2Catalog(catalog_cache=CatalogCache(':memory:'), limiter=limiter, responses=ResponseCache(),
+                         transport=transport)
+
+    model = new_model(world, transport, limiter, catalog)
+    cold = timed(model.init_from_api)
+    cold_requests = transport.stats()
+
+    warm_model = new_model(world, transport, limiter, catalog)
+    warm = timed(warm_model.init_from_api)
+
+    refresh = timed(warm_model.refresh_from_api)
+
+    return model, {'init_from_api': cold, 'init_from_api_warm_catalog': warm, 'refresh_from_api': refresh,
+                   'api': cold_requests, 'api_total': transport.stats(), 'items': len(model.items),
+                   'recipes': len(model.recipes), 'load_report': model.load_report.to_dict(),
+                   'refresh_report': warm_model.load_report.to_dict()}
+
+
+def advice_output(model: Model) -> dict:
+    # items refreshed are listed after others, so advice is compared by item, not by position in list
+    return {getter: sorted((advice.item.item_id, advice.item.account_bound, str(advice.advice),
+                            [(source.count, source.slots, source.place, source.account) for source in advice.sources])
+                           for advice in getattr(model, getter)())
+            for getter in advice_getters}
+
+
+def change_world(world: SyntheticWorld, seed: int) -> None:
+    # slots move between places of each account, some characters change without their last modification changing
+    changes = random.Random(seed)
+    for account in world.accounts.values():
+        places = [bag['inventory'] for character in account['characters'].values() for bag in character['bags']]
+        places.append(account['bank'])
+        for _ in range(len(places) * 2):
+            first, second = changes.choice(places), changes.choice(places)
+            i, j = changes.randrange(len(first)), changes.randrange(len(second))
+            first[i], second[j] = second[j], first[i]
+        for index, character in enumerate(account['characters'].values()):
+            if index % 2 == 0:
+                character['last_modified'] = character['last_modified'] + '1'
+
+
+def check_refresh(world: SyntheticWorld, args: argparse.Namespace) -> dict:
+    # refresh after change has to give same advice as full load of changed accounts
+    world = copy.copy(world)
+    world.accounts = copy.deepcopy(world.accounts)
+    transport = ReplayTransport(world, seed=args.seed)
+    limiter = RateLimiter(args.rate, args.burst)
+    catalog = GW2Catalog(catalog_cache=CatalogCache(':memory:'), limiter=limiter, responses=ResponseCache(),
+                         transport=transport)
+    model = new_model(world, transport, limiter, catalog)
+    model.init_from_api()
+    change_world(world, args.seed)
+    model.refresh_from_api()
+    reloaded = new_model(world, transport, limiter, catalog)
+    reloaded.init_from_api()
+    refreshed_output, reloaded_output = advice_output(model), advice_output(reloaded)
+    return {'refresh_matches_reload': refreshed_output == reloaded_output,
+            'refresh_differs': [getter for getter in advice_getters
+                                if refreshed_output[getter] != reloaded_output[getter]]}
+
+
+def bench_advice(model: Model) -> dict:
+    advice = dict()
+    sizes = dict()
+    for getter in advice_getters:
+        # cold cache, so getter evaluates its category
+        model.advice_cache = AdviceCache()
+        advice[getter] = timed(getattr(model, getter))
+        sizes[getter] = len(getattr(model, getter)())
+    single_pass = timed(lambda: AdviceEngine(model).evaluate())
+    return {'advice': advice, 'advice_sizes': sizes, 'advice_single_pass': single_pass}
+
+
+def bench_ui(model: Model) -> dict:
+    # nicegui is needed only here, rest of benchmark runs without it
+    from nicegui import Client
+    from nicegui.page import page
+
+    from ui.advice.advice_craft_ui import AdviceCraftUi
+    from ui.advice.advice_gobble_ui import AdviceGobbleUi
+    from ui.advice.advice_just_delete_ui import AdviceJustDeleteUi
+    from ui.advice.advice_just_salvage_ui import AdviceJustSalvageUi
+    from ui.advice.advice_karma_consumables_ui import AdviceKarmaConsumablesUi
+    from ui.advice.advice_ls3ls4ibs_ui import AdviceLS3LS4IBSUi
+    from ui.advice.advice_luck_craft_ui import AdviceLuckCraftUi
+    from ui.advice.advice_misc_ui import AdviceMiscUi
+    from ui.advice.advice_play_to_consume_ui import AdvicePlayToConsumeUi
+    from ui.advice.advice_rare_salvage_ui import AdviceRareSalvageUi
+    from ui.advice.advice_stacks_ui import AdviceStacksUi
+    from ui.advice.advice_vendor_ui import AdviceVendorUi
+    from ui.ui_model import UiModel
+
+    ui_model = UiModel()
+    ui_model.model = model
+
+    rendering = dict()
+    elements = dict()
+    client = Client(page('/bench'), request=None)
+    with client:
+        for panel in [AdviceStacksUi, AdviceCraftUi, AdviceGobbleUi, AdviceVendorUi, AdviceRareSalvageUi,
+                      AdviceJustSalvageUi, AdviceLuckCraftUi, AdviceKarmaConsumablesUi, AdvicePlayToConsumeUi,
+                      AdviceLS3LS4IBSUi, AdviceJustDeleteUi, AdviceMiscUi]:
+            before = len(client.elements)
+            rendering[panel.__name__] = timed(lambda: panel(ui_model))
+            elements[panel.__name__] = len(client.elements) - before
+    payload = timed(lambda: [element._to_dict() for element in client.elements.values()])
+    return {'ui': rendering, 'ui_elements': elements, 'ui_serialize': payload}
+
+
+def summarize(runs: list[dict]) -> dict:
+    summary = dict()
+    for key in ['init_from_api', 'init_from_api_warm_catalog', 'refresh_from_api', 'advice_single_pass',
+                'ui_serialize']:
+        values = [run[key] for run in runs if key in run]
+        if values:
+            summary[key] = {'median': statistics.median(values), 'min': min(values), 'max': max(values)}
+    for group in ['advice', 'ui']:
+        names = runs[0].get(group, dict()).keys()
+        summary[group] = {name: statistics.median(run[group][name] for run in runs) for name in names}
+    return summary
+
+
+def main() -> None:
+    defaults = SyntheticConfig()
+    parser = argparse.ArgumentParser(description="Benchmark of loading and advice on synthetic accounts, no api key "
+                                                 "or network needed")
+    parser.add_argument('--accounts', type=int, default=defaults.accounts)
+    parser.add_argument('--characters', type=int, default=defaults.characters)
+    parser.add_argument('--bags', type=int, default=defaults.bags_per_character, help='Bags per character')
+    parser.add_argument('--bag-size', type=int, default=defaults.bag_size)
+    parser.add_argument('--bank-tabs', type=int, default=defaults.bank_tabs)
+    parser.add_argument('--material-kinds', type=int, default=defaults.material_kinds)
+    parser.add_argument('--material-storage', type=int, default=defaults.material_storage_size,
+                        help='Largest count of material in storage')
+    parser.add_argument('--catalog-items', type=int, default=defaults.catalog_items)
+    parser.add_argument('--catalog-recipes', type=int, default=defaults.catalog_recipes)
+    parser.add_argument('--item-mix', type=str, default=None,
+                        help='Share of item kinds in slots as json, e.g. {"material": 0.5, "junk": 0.5}')
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every api request')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many seconds added on top of latency')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of api requests failing with 503')
+    parser.add_argument('--rate', type=float, default=1000000.0,
+                        help='Requests per second allowed by rate limiter, api allows 5')
+    parser.add_argument('--burst', type=int, default=1000000, help='Burst allowed by rate limiter, api allows 300')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-ui', action='store_true', help='Skip rendering of advice panels')
+    parser.add_argument('--output', type=str, default=BENCH_REPORT_FILE)
+    args = parser.parse_args()
+
+    config = SyntheticConfig(accounts=args.accounts, characters=args.characters, bags_per_character=args.bags,
+                             bag_size=args.bag_size, bank_tabs=args.bank_tabs, material_kinds=args.material_kinds,
+                             material_storage_size=args.material_storage, catalog_items=args.catalog_items,
+                             catalog_recipes=args.catalog_recipes, seed=args.seed)
+    if args.item_mix:
+        config.item_mix = json.loads(args.item_mix)
+
+    world_start = time.perf_counter()
+    world = SyntheticWorld(config)
+    print(f"Generated {len(world.accounts)} accounts, {len(world.items)} items, {len(world.recipes)} recipes "
+          f"in {time.perf_counter() - world_start:.2f}s")
+
+    runs = []
+    for repeat in range(args.repeat):
+        model, run = bench_load(world, args)
+        run.update(bench_advice(model))
+        if not args.no_ui:
+            run.update(bench_ui(model))
+        runs.append(run)
+        print(f"Run {repeat + 1}/{args.repeat}: load {run['init_from_api']:.3f}s, "
+              f"advice {run['advice_single_pass']:.3f}s, {run['api']['total_requests']} requests")
+
+    refresh_check = check_refresh(world, args)
+    print(f"Refresh matches full reload: {refresh_check['refresh_matches_reload']}")
+
+    report = {
+        'version': report_version,
+        'created': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': asdict(config),
+        'api': {'latency': args.latency, 'jitter': args.jitter, 'error_rate': args.error_rate, 'rate': args.rate,
+                'burst': args.burst},
+        'summary': summarize(runs),
+        'refresh_check': refresh_check,
+        'runs': runs,
+    }
+    with open(args.output, 'w', encoding='utf-8') as out_file:
+        json.dump(report, out_file, indent=2)
+    print(f"Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
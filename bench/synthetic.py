@@ -0,0 +1,153 @@
+import random
+from dataclasses import dataclass, field
+
+from data.model_config import advice_rules
+
+# generated items get ids from here on, so they never clash with items used by advice rules
+first_item_id = 100000
+
+ecto_item_id = 19721
+
+bank_tab_size = 30
+
+
+@dataclass
+class SyntheticConfig:
+    accounts: int = 2
+    characters: int = 10
+    bags_per_character: int = 8
+    bag_size: int = 20
+    bank_tabs: int = 8
+    shared_slots: int = 6
+    material_kinds: int = 300
+    # largest count of single material in storage, material storage is sized by it
+    material_storage_size: int = 1500
+    empty_slot_ratio: float = 0.2
+    catalog_items: int = 20000
+    catalog_recipes: int = 12000
+    # share of slots holding each kind of item
+    item_mix: dict[str, float] = field(default_factory=lambda: {'material': 0.35, 'junk': 0.15, 'gear': 0.15,
+                                                                 'consumable': 0.2, 'salvage': 0.1, 'rule': 0.05})
+    seed: int = 1
+
+
+class SyntheticWorld:
+    # accounts and frozen catalog, everything the api would serve for them
+
+    def __init__(self, config: SyntheticConfig):
+        self.config = config
+        self.random = random.Random(config.seed)
+
+        self.items: dict[int, dict] = dict()
+        self.item_ids_by_kind: dict[str, list[int]] = {kind: [] for kind in config.item_mix.keys()}
+        self.build_items()
+
+        self.recipes: dict[int, dict] = dict()
+        self.recipes_by_ingredient: dict[int, list[int]] = dict()
+        self.build_recipes()
+
+        # api key -> account
+        self.accounts: dict[str, dict] = dict()
+        for index in range(config.accounts):
+            self.accounts[f'BENCH-{index:04d}'] = self.build_account(index)
+
+    def add_item(self, item_id: int, kind: str) -> None:
+        rarity = {'junk': 'Junk', 'gear': self.random.choice(['Fine', 'Masterwork', 'Rare', 'Exotic'])}.get(
+            kind, self.random.choice(['Basic', 'Fine', 'Masterwork', 'Rare']))
+        item_type = {'material': 'CraftingMaterial', 'junk': 'Trophy', 'consumable': 'Consumable',
+                     'salvage': 'Consumable', 'rule': 'Trophy'}.get(
+            kind, self.random.choice(['Armor', 'Weapon', 'Trinket', 'Back']))
+        item = {
+            'id': item_id,
+            'name': f'Synthetic {kind} {item_id}',
+            'description': 'Salvage Item' if kind == 'salvage' else f'Generated {kind} for benchmark.',
+            'type': item_type,
+            'level': self.random.choice([0, 60, 80]),
+            'rarity': rarity,
+            'vendor_value': self.random.randint(0, 500),
+            'default_skin': self.random.randint(1, 9000),
+            'game_types': ['Activity', 'Wvw', 'Dungeon', 'Pve'],
+            'flags': self.random.sample(['AccountBound', 'NoSalvage', 'NoSell', 'SoulbindOnAcquire', 'HideSuffix'],
+                                        self.random.choice([0, 0, 0, 1, 2])),
+            'restrictions': [],
+            'chat_link': f'[&AgH{item_id:08d}]',
+            'icon': f'https://render.guildwars2.com/file/{item_id:032X}/{item_id}.png',
+            'details': {'type': self.random.choice(['Food', 'Utility', 'Generic', 'Booze']),
+                        'description': None if kind == 'salvage' else 'Double-click to consume.',
+                        'duration_ms': 1800000,
+                        'infix_upgrade': {'id': 112, 'attributes': [{'attribute': 'Power', 'modifier': 25}]}},
+        }
+        self.items[item_id] = item
+        self.item_ids_by_kind[kind].append(item_id)
+
+    def build_items(self) -> None:
+        kinds = [kind for kind in self.config.item_mix.keys() if kind != 'rule']
+        for index in range(self.config.catalog_items):
+            self.add_item(first_item_id + index, kinds[index % len(kinds)])
+
+        rule_item_ids = {ecto_item_id}
+        for category in ('craft_luck', 'play_to_consume', 'gobbler', 'misc', 'karma_consumables', 'ls3ls4ibs'):
+            for item_id, rules in getattr(advice_rules, category).items():
+                rule_item_ids.add(item_id)
+                for _, rule in rules:
+                    if hasattr(rule, 'gobbler_item_id'):
+                        rule_item_ids.add(rule.gobbler_item_id)
+        for item_id in sorted(rule_item_ids):
+            self.add_item(item_id, 'rule')
+
+    def build_recipes(self) -> None:
+        materials = self.item_ids_by_kind['material']
+        item_ids = list(self.items.keys())
+        for index in range(self.config.catalog_recipes):
+            recipe_id = index + 1
+            ingredients = [{'type': 'Item', 'id': item_id, 'count': self.random.randint(1, 10)}
+                           for item_id in self.random.sample(materials, self.random.randint(1, 4))]
+            self.recipes[recipe_id] = {
+                'id': recipe_id,
+                'type': self.random.choice(['Refinement', 'IngredientCooking', 'Weapon', 'Armor', 'Component']),
+                'output_item_id': self.random.choice(item_ids),
+                'output_item_count': self.random.randint(1, 5),
+                'time_to_craft_ms': 1000,
+                'disciplines': ['Armorsmith', 'Artificer', 'Huntsman', 'Weaponsmith'],
+                'min_rating': self.random.randint(0, 500),
+                'flags': ['AutoLearned'],
+                'ingredients': ingredients,
+                'chat_link': f'[&CR{recipe_id:08d}]',
+            }
+            for ingredient in ingredients:
+                self.recipes_by_ingredient.setdefault(ingredient['id'], []).append(recipe_id)
+
+    def random_slot(self) -> dict | None:
+        if self.random.random() < self.config.empty_slot_ratio:
+            return None
+        kinds = list(self.config.item_mix.keys())
+        kind = self.random.choices(kinds, [self.config.item_mix[kind] for kind in kinds])[0]
+        item_id = self.random.choice(self.item_ids_by_kind[kind])
+        count = 1 if kind == 'gear' else self.random.randint(1, 250)
+        slot = {'id': item_id, 'count': count}
+        if 'AccountBound' in self.items[item_id]['flags']:
+            slot['binding'] = 'Account'
+        return slot
+
+    def build_account(self, index: int) -> dict:
+        characters = dict()
+        for character_index in range(self.config.characters):
+            name = f'Bench Character {index}-{character_index}'
+            characters[name] = {
+                'name': name,
+                'age': self.random.randint(3600, 3600 * 2000),
+                'last_modified': f'2024-01-{character_index % 28 + 1:02d}T12:00:00Z',
+                'bags': [{'id': 8932, 'size': self.config.bag_size,
+                          'inventory': [self.random_slot() for _ in range(self.config.bag_size)]}
+                         for _ in range(self.config.bags_per_character)],
+            }
+        materials = [{'id': item_id, 'category': 5,
+                      'count': self.random.randint(0, self.config.material_storage_size)}
+                     for item_id in self.item_ids_by_kind['material'][:self.config.material_kinds]]
+        return {
+            'name': f'Bench Account.{index:04d}',
+            'characters': characters,
+            'materials': materials,
+            'bank': [self.random_slot() for _ in range(self.config.bank_tabs * bank_tab_size)],
+            'shared_slots': [self.random_slot() for _ in range(self.config.shared_slots)],
+        }
@@ -2,4 +2,4 @@ rm -rf ./build
 rm -r ./dist
 rm ./*.spec
 ver=$(cut -d "'" -f2 < version.py)
-nicegui-pack --onefile --name "GW2 inventory cleanup tool"$ver app.py
\ No newline at end of file
+nicegui-pack --onefile --add-data "data/advice_rules.json:data" --name "GW2 inventory cleanup tool"$ver app.py
\ No newline at end of file
@@ -0,0 +1,47 @@
+import threading
+from typing import Callable
+
+# results of this many latest model generations are kept, older are evicted
+kept_generations = 1
+
+
+class AdviceCache:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # generation -> advice name -> advice result
+        self.entries: dict[int, dict[str, object]] = dict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compute(self, generation: int, name: str, compute: Callable[[], object]) -> object:
+        with self.lock:
+            results = self.entries.get(generation, None)
+            if results is not None and name in results:
+                self.hits = self.hits + 1
+                return results[name]
+            self.misses = self.misses + 1
+
+        value = compute()
+
+        with self.lock:
+            self.entries.setdefault(generation, dict())[name] = value
+            self.evict()
+        return value
+
+    def put(self, generation: int, name: str, value: object) -> None:
+        with self.lock:
+            self.entries.setdefault(generation, dict())[name] = value
+            self.evict()
+
+    def evict(self) -> None:
+        for generation in sorted(self.entries.keys())[:-kept_generations]:
+            self.evictions = self.evictions + len(self.entries[generation])
+            del self.entries[generation]
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': sum(len(results) for results in self.entries.values())}
+
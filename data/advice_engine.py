@@ -0,0 +1,129 @@
+from dataclasses import dataclass, field, fields
+
+from data.item import Item, ItemForDisplay
+from data.model_config import AdviceRules, advice_rules
+from data.source import stack_size
+
+
+@dataclass
+class AdviceReport:
+    stacks: list[ItemForDisplay] = field(default_factory=list)
+    vendor: list[ItemForDisplay] = field(default_factory=list)
+    rare_salvage: list[ItemForDisplay] = field(default_factory=list)
+    craft_luck: list[ItemForDisplay] = field(default_factory=list)
+    just_delete: list[ItemForDisplay] = field(default_factory=list)
+    just_salvage: list[ItemForDisplay] = field(default_factory=list)
+    play_to_consume: list[ItemForDisplay] = field(default_factory=list)
+    gobbler: list[ItemForDisplay] = field(default_factory=list)
+    misc: list[ItemForDisplay] = field(default_factory=list)
+    karma_consumables: list[ItemForDisplay] = field(default_factory=list)
+    ls3ls4ibs: list[ItemForDisplay] = field(default_factory=list)
+    craft: list[ItemForDisplay] = field(default_factory=list)
+
+
+advice_categories = tuple(report_field.name for report_field in fields(AdviceReport))
+
+rule_categories = ('craft_luck', 'play_to_consume', 'gobbler', 'misc', 'karma_consumables', 'ls3ls4ibs')
+
+
+class AdviceEngine:
+
+    def __init__(self, model, rules: AdviceRules = advice_rules, categories: tuple = advice_categories):
+        self.model = model
+        self.counts = model.counts
+        self.rules = rules
+        # only these categories are evaluated, others stay empty in report
+        self.categories = frozenset(categories)
+
+    def evaluate(self) -> AdviceReport:
+        report = AdviceReport()
+        ordered: dict[str, list[tuple[int, ItemForDisplay]]] = {name: [] for name in rule_categories
+                                                                if name in self.categories}
+
+        if self.categories - {'craft'}:
+            for item in self.model.items.values():
+                self.evaluate_item(item, report)
+                if ordered and self.counts.has_item(item.item_id):
+                    self.evaluate_rules(item, ordered)
+
+        for name, advices in ordered.items():
+            advices.sort(key=lambda advice: advice[0])
+            setattr(report, name, [advice for _, advice in advices])
+
+        if 'craft' in self.categories:
+            report.craft = self.craft_advice()
+
+        return report
+
+    def evaluate_item(self, item: Item, report: AdviceReport) -> None:
+        if 'stacks' in self.categories:
+            stack_sources = item.get_advice_stacks(self.model.material_storage_size, self.counts)
+            if len(stack_sources) > 0:
+                report.stacks.append(ItemForDisplay(item, sources=stack_sources))
+
+        if 'vendor' in self.categories and item.rarity == 'Junk':
+            report.vendor.append(ItemForDisplay(item))
+
+        if 'rare_salvage' in self.categories and item.rare_for_salvage and item.price is not None:
+            if item.price > self.model.ecto_salvage_price:
+                report.rare_salvage.append(ItemForDisplay(item, advice='Salvage!'))
+            elif not item.account_bound:
+                report.rare_salvage.append(ItemForDisplay(item, advice='Sell!'))
+
+        if 'just_delete' in self.categories and item.deletable:
+            report.just_delete.append(ItemForDisplay(item))
+
+        if 'just_salvage' in self.categories and item.description == "Salvage Item" \
+                and item.item_id not in self.rules.just_salvage_exclude:
+            report.just_salvage.append(ItemForDisplay(item, advice="Salvage this item"))
+
+    def evaluate_rules(self, item: Item, ordered: dict[str, list[tuple[int, ItemForDisplay]]]) -> None:
+        # rules are looked up by id of owned item, number of rules does not matter
+        item_id = item.item_id
+
+        for order, _ in self.rules_for(ordered, 'craft_luck', item_id):
+            for account in self.counts.accounts:
+                if self.counts.total(item_id, account) > stack_size:
+                    ordered['craft_luck'].append(
+                        (order, ItemForDisplay(item, sources=self.counts.sources_for_account(item_id, account))))
+
+        for order, advice in self.rules_for(ordered, 'play_to_consume', item_id):
+            ordered['play_to_consume'].append((order, ItemForDisplay(item, advice=advice.text)))
+
+        for order, gobble in self.rules_for(ordered, 'gobbler', item_id):
+            if self.counts.has_item(gobble.gobbler_item_id):
+                for account in self.counts.accounts:
+                    if self.counts.total(item_id, account) > self.model.material_storage_size[account]:
+                        ordered['gobbler'].append(
+                            (order, ItemForDisplay(self.model.items[gobble.gobbler_item_id],
+                                                   sources=self.counts.sources_for_account(gobble.gobbler_item_id,
+                                                                                           account))))
+
+        for order, misc in self.rules_for(ordered, 'misc', item_id):
+            if self.counts.total(item_id) >= misc.min_size:
+                ordered['misc'].append((order, ItemForDisplay(item, advice=misc.text)))
+
+        for order, _ in self.rules_for(ordered, 'karma_consumables', item_id):
+            ordered['karma_consumables'].append((order, ItemForDisplay(item, advice="Consume to get karma.")))
+
+        for order, advice in self.rules_for(ordered, 'ls3ls4ibs', item_id):
+            for account in self.counts.accounts:
+                if self.counts.total(item_id, account) > self.model.material_storage_size[account]:
+                    ordered['ls3ls4ibs'].append(
+                        (order, ItemForDisplay(item, advice=advice.text,
+                                               sources=self.counts.sources_for_account(item_id, account))))
+
+    def rules_for(self, ordered: dict, name: str, item_id: int) -> tuple:
+        return getattr(self.rules, name).get(item_id, ()) if name in ordered else ()
+
+    def craft_advice(self) -> list[ItemForDisplay]:
+        craft_advice: list[ItemForDisplay] = []
+
+        account_bound_item_ids = {item.item_id for item in self.model.items.values() if item.account_bound}
+
+        for output_item_id in self.model.recipe_engine.craft_advice(self.counts, account_bound_item_ids):
+            # recipe has invalid item id output, it was not returned in items, not a valid recipe
+            if output_item_id in self.model.recipe_results:
+                craft_advice.append(ItemForDisplay(self.model.recipe_results[output_item_id], advice="Craft"))
+
+        return craft_advice
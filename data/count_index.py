@@ -0,0 +1,64 @@
+from array import array
+
+from data.source import Source
+
+# all characters count as single kind of place
+place_kinds = ['$character', '$storage', '$bank', '$shared_slot']
+
+place_kind_index = {place_kind: index for index, place_kind in enumerate(place_kinds)}
+
+
+def place_kind_of(place: str) -> int:
+    return place_kind_index.get(place, 0)
+
+
+class CountIndex:
+
+    def __init__(self, items: dict, accounts: list[str]):
+        self.accounts = accounts
+        self.account_index = {account: index for index, account in enumerate(accounts)}
+
+        # item id -> counts for every account and place kind, account major
+        self.by_place: dict[int, array] = dict()
+        # item id -> counts for every account
+        self.by_account: dict[int, array] = dict()
+        self.totals: dict[int, int] = dict()
+        self.sources: dict[tuple[int, int], list[Source]] = dict()
+
+        for item_id, item in items.items():
+            by_place = array('q', bytes(8 * len(accounts) * len(place_kinds)))
+            by_account = array('q', bytes(8 * len(accounts)))
+            for source in item.sources:
+                account = self.account_index.get(source.account, None)
+                if account is None:
+                    continue
+                by_place[account * len(place_kinds) + place_kind_of(source.place)] += source.count
+                by_account[account] += source.count
+                self.sources.setdefault((item_id, account), []).append(source)
+            self.by_place[item_id] = by_place
+            self.by_account[item_id] = by_account
+            self.totals[item_id] = sum(by_account)
+
+    def total(self, item_id: int, account: str = None, place: str = None) -> int:
+        if item_id not in self.totals:
+            return 0
+        if place is not None:
+            kind = place_kind_of(place)
+            if account is None:
+                return sum(self.by_place[item_id][kind::len(place_kinds)])
+            return self.by_place[item_id][self.account_index[account] * len(place_kinds) + kind]
+        if account is None:
+            return self.totals[item_id]
+        return self.by_account[item_id][self.account_index[account]]
+
+    def has_item(self, item_id: int) -> bool:
+        return self.totals.get(item_id, 0) > 0
+
+    def sources_for_account(self, item_id: int, account: str) -> list[Source]:
+        return self.sources.get((item_id, self.account_index[account]), [])
+
+    def items_over(self, count: int, account: str = None) -> list[int]:
+        if account is None:
+            return [item_id for item_id, total in self.totals.items() if total > count]
+        index = self.account_index[account]
+        return [item_id for item_id, by_account in self.by_account.items() if by_account[index] > count]
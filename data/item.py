@@ -1,14 +1,17 @@
 import math
 from typing import List
 
-from data.source import Source
+from data.count_index import CountIndex
+from data.source import Source, stack_size
 
 
 class Item:
+    __slots__ = ('item_id', 'sources', 'account_bound', 'name', 'description', 'icon', 'rarity', 'stackable',
+                 'deletable', 'rare_for_salvage', 'price', 'wiki_link')
 
     def __init__(self, item_id: int):
         self.item_id = item_id
-        self.sources = []
+        self.sources: list[Source] = []
 
         self.account_bound = False
         self.name = None
@@ -19,15 +22,20 @@ class Item:
         self.deletable = False
         self.rare_for_salvage = False
         self.price = None
+        self.wiki_link = None
 
     def add(self, source: Source) -> None:
-        self.sources.append(source)
+        # slots of one place are added one after another, so they end up as single source
+        if self.sources and self.sources[-1].place == source.place and self.sources[-1].account == source.account:
+            self.sources[-1].merge(source)
+        else:
+            self.sources.append(source)
 
-    def get_advice_stacks(self, material_storage_size: dict) -> list:
+    def get_advice_stacks(self, material_storage_size: dict, counts: CountIndex) -> list:
         if not self.account_bound:
             stackable_source = self.get_partial_stacks(material_storage_size)
-            number_of_partial_stacks = len(stackable_source)
-            number_of_stacks_consolidated = math.ceil(self.total_count() / 250)
+            number_of_partial_stacks = sum(source.slots for source in stackable_source)
+            number_of_stacks_consolidated = math.ceil(counts.total(self.item_id) / stack_size)
             if self.stackable and (number_of_partial_stacks > 1
                                    and number_of_partial_stacks > number_of_stacks_consolidated):
                 return stackable_source
@@ -37,8 +45,8 @@ class Item:
             stackable_sources = []
             for account in material_storage_size.keys():
                 stackable_source = self.get_partial_stacks({account: material_storage_size.get(account)})
-                number_of_partial_stacks = len(stackable_source)
-                number_of_stacks_consolidated = math.ceil(self.total_count(account) / 250)
+                number_of_partial_stacks = sum(source.slots for source in stackable_source)
+                number_of_stacks_consolidated = math.ceil(counts.total(self.item_id, account) / stack_size)
                 if self.stackable and (number_of_partial_stacks > 1
                                        and number_of_partial_stacks > number_of_stacks_consolidated):
                     stackable_sources.extend(stackable_source)
@@ -48,30 +56,22 @@ class Item:
         partial_stacks = []
         for source in self.sources:
             if source.account in material_storage_size.keys():
-                if source.count != 0 and (source.count < 250 or (
-                        source.place == '$storage' and source.count < material_storage_size[source.account])):
-                    partial_stacks.append(source)
+                if source.place == '$storage':
+                    # material storage has single slot for item
+                    if source.count != 0 and (source.count < stack_size or source.count < material_storage_size[
+                        source.account]):
+                        partial_stacks.append(source)
+                elif source.partial_slots > 0:
+                    partial_stacks.append(
+                        Source(source.partial_count, source.place, source.account, source.partial_slots))
         return partial_stacks
 
-    def total_count(self, account=None) -> int:
-        total = 0
-        for source in self.sources:
-            if account is None or source.account == account:
-                total = total + source.count
-        return total
-
-    def get_sources_for_account(self, account) -> list[Source]:
-        sources_for_account = []
-        for source in self.sources:
-            if source.account == account:
-                sources_for_account.append(source)
-        return sources_for_account
-
     def __repr__(self):
         return str(self.item_id) + " " + str(self.name) + " " + str(self.sources)
 
 
 class ItemForDisplay:
+    __slots__ = ('item', 'sources', 'advice')
 
     def __init__(self, item: Item, sources: list[Source] = None, advice: str = None):
         self.item = item
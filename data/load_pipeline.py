@@ -0,0 +1,66 @@
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable
+
+from data.load_report import LoadTimer
+from reader.parallel import cancelling_executor
+
+# how many stages can run at the same time
+pipeline_workers = 4
+
+
+class Stage:
+
+    def __init__(self, name: str, action: Callable[[], None], depends_on: list[str] = None):
+        self.name = name
+        self.action = action
+        self.depends_on = depends_on if depends_on else []
+
+    def __repr__(self):
+        return self.name + " <- " + str(self.depends_on)
+
+
+class LoadPipeline:
+
+    def __init__(self, workers: int = pipeline_workers, timer: LoadTimer = None,
+                 on_stage_done: Callable[[str, int, int], None] = None):
+        self.workers = workers
+        self.stages: dict[str, Stage] = dict()
+        self.timer = timer if timer else LoadTimer()
+        # called with name of finished stage, count of finished stages and count of all stages
+        self.on_stage_done = on_stage_done
+
+    def add(self, name: str, action: Callable[[], None], depends_on: list[str] = None) -> None:
+        self.stages[name] = Stage(name, action, depends_on)
+
+    def run(self) -> None:
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f'Stage {stage.name} depends on unknown stage {dependency}')
+
+        pending = dict(self.stages)
+        done = set()
+        running = dict()
+
+        with cancelling_executor(self.workers) as executor:
+            while pending or running:
+                for stage in list(pending.values()):
+                    if all(dependency in done for dependency in stage.depends_on):
+                        running[executor.submit(self.run_stage, stage)] = stage.name
+                        del pending[stage.name]
+
+                if not running:
+                    raise ValueError(f'Stages {list(pending.values())} have circular dependencies')
+
+                finished, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    # re-raises exception of failed stage, other stages are not started anymore
+                    future.result()
+                    done.add(name)
+                    if self.on_stage_done:
+                        self.on_stage_done(name, len(done), len(self.stages))
+
+    def run_stage(self, stage: Stage) -> None:
+        with self.timer.stage(stage.name):
+            stage.action()
@@ -0,0 +1,66 @@
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class StageTiming:
+    name: str
+    # seconds since start of load
+    started: float
+    wall: float
+    cpu: float
+
+
+class LoadTimer:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.stages: list[StageTiming] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        # cpu time is of current thread, stages run in their own threads
+        started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            yield
+        finally:
+            timing = StageTiming(name, started - self.started, time.perf_counter() - started,
+                                 time.thread_time() - cpu_started)
+            with self.lock:
+                self.stages.append(timing)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+@dataclass
+class LoadReport:
+    kind: str
+    created: float
+    wall: float
+    completed: bool
+    stages: list[StageTiming] = field(default_factory=list)
+    # endpoint -> requests, bytes, retries, errors and latency percentiles, and cache hits per kind
+    requests: dict = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def summary(self) -> list[str]:
+        lines = [f"{'Load' if self.kind == 'init' else 'Refresh'} took {self.wall:.2f}s"
+                 f"{'' if self.completed else ', not completed'}"]
+        for stage in sorted(self.stages, key=lambda stage: stage.started):
+            lines.append(f"  {stage.name}: {stage.wall:.3f}s wall, {stage.cpu:.3f}s cpu, at {stage.started:.3f}s")
+        for name, endpoint in self.requests.get('endpoints', dict()).items():
+            latency = endpoint.get('latency_ms', dict())
+            lines.append(f"  {name}: {endpoint['requests']} requests, {endpoint['bytes']} bytes, "
+                         f"{endpoint['retries']} retries, {endpoint['errors']} errors, "
+                         f"p50 {latency.get('p50', 0)}ms, p90 {latency.get('p90', 0)}ms, "
+                         f"p99 {latency.get('p99', 0)}ms")
+        for kind, cache in self.requests.get('cache', dict()).items():
+            lines.append(f"  cache {kind}: {cache['hits']} hits, {cache['misses']} misses")
+        return lines
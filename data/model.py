@@ -1,22 +1,48 @@
-from functools import lru_cache
+import threading
+import time
 from math import ceil
+from typing import Callable
 
+from data.advice_cache import AdviceCache
+from data.advice_engine import AdviceEngine
+from data.count_index import CountIndex
 from data.item import Item, ItemForDisplay
-from data.model_config import Gobble, MiscAdvice
-from data.source import Source
+from data.load_pipeline import LoadPipeline, pipeline_workers
+from data.load_report import LoadReport, LoadTimer
+from data.recipe_engine import RecipeEngine
+from data.source import Source, stack_size
+from log_config import logger
 from messaging.messaging import Listener, Messaging
+from messaging.progress import ProgressEvent
 from reader.gw2api import GW2Api
+from reader.gw2catalog import GW2Catalog, shared_catalog
+from reader.request_stats import RequestStats
+
+# up to this many ingredients, recipes are searched by ingredient instead of loading whole recipe catalog
+recipe_search_max_ingredients = 60
+
+# advice categories are published as soon as load stages they need are done, first group needs item details only
+advice_publishing = [
+    (('item_info',), ('vendor', 'just_delete', 'just_salvage')),
+    (('item_info', 'counts'),
+     ('stacks', 'craft_luck', 'play_to_consume', 'gobbler', 'misc', 'karma_consumables', 'ls3ls4ibs')),
+    (('prices', 'ecto_price'), ('rare_salvage',)),
+    (('recipes',), ('craft',)),
+]
 
 
 class Model(Listener):
 
-    def __init__(self, apis: list[GW2Api], messaging: Messaging, include_consumables=False):
+    def __init__(self, apis: list[GW2Api], messaging: Messaging, include_consumables=False,
+                 catalog: GW2Catalog = None):
         self.messaging = messaging
         self.aborted = False
         self.is_ready = False
 
         self.items: dict[int, Item] = dict()
+        self.counts = CountIndex(self.items, [])
         self.empty_slots = 0
+        self.loaded_accounts = 0
         self.ecto_salvage_price = None
         self.material_storage_size = dict()
 
@@ -26,40 +52,132 @@ class Model(Listener):
 
         self.recipes = []
         self.recipe_results: dict[int, Item] = dict()
+        self.recipe_engine = RecipeEngine([])
 
         self.apis = apis
+        # public data is loaded by catalog shared by all accounts, created on first load
+        self.catalog = catalog
+
+        self.lock = threading.Lock()
+        self.described_item_ids = set()
+
+        # what previous load saw, so refresh can load only what changed since
+        self.character_states: dict[str, dict] = dict()
+        self.empty_slots_by_place: dict[str, dict[str, int]] = dict()
+        self.refreshed_places = 0
+        # api -> merge of its loaded data, waiting for its turn; two api keys can belong to same account
+        self.pending_merges: dict[GW2Api, Callable[[], str]] = dict()
+
+        # advice is cached per generation of loaded data
+        self.generation = 0
+        self.advice_cache = AdviceCache()
+        # categories of advice which are complete for current generation
+        self.ready_advice: set[str] = set()
+
+        # timing of stages and api requests of last load
+        self.timer = LoadTimer()
+        self.load_report: LoadReport | None = None
+
+    def next_generation(self) -> None:
+        with self.lock:
+            self.generation = self.generation + 1
+            self.ready_advice = set()
+        logger.info(f"Model generation {self.generation}, advice cache {self.advice_cache.stats()}")
 
     def init_from_api(self) -> None:
         if len(self.apis) == 0:
             return
 
+        self.next_generation()
         self.aborted = False
+        self.use_catalog()
         for api in self.apis:
             api.aborted = False
+        self.timer = LoadTimer()
+        checkpoints = self.stats_checkpoints()
         self.is_ready = False
         self.items = dict()
+        self.counts = CountIndex(self.items, [])
+        self.empty_slots = 0
+        self.loaded_accounts = 0
         self.material_storage_size = dict()
-        self.accounts = []
+        self.accounts = [api.account_name() for api in self.apis]
 
         self.recipes = []
         self.recipe_results: dict[int, Item] = dict()
+        self.recipe_engine = RecipeEngine([])
+        self.described_item_ids = set()
+        self.character_states = dict()
+        self.empty_slots_by_place = dict()
+        self.pending_merges = dict()
+
+        # every account gets its own worker, plus some for catalog stages
+        pipeline = LoadPipeline(len(self.apis) + pipeline_workers, self.timer, self.stage_done)
+        merge_stages = self.add_account_stages(pipeline, 'inventory', self.build_account)
+        item_info_stages = []
+        for index, merge_stage in enumerate(merge_stages):
+            # details of items can be loaded while next account is being loaded
+            pipeline.add(f'item_info#{index}', self.build_item_info, [merge_stage])
+            item_info_stages.append(f'item_info#{index}')
+
+        pipeline.add('counts', self.build_count_index, merge_stages)
+        pipeline.add('recipes', self.build_recipe_info, ['counts'])
+        pipeline.add('prices', self.build_prices, item_info_stages)
+        pipeline.add('ecto_price', self.build_ecto_price)
+        self.add_advice_stages(pipeline, {'item_info': item_info_stages})
+
+        self.report_progress('load', "Loading account data", done=0, total=len(pipeline.stages))
+        completed = False
+        try:
+            pipeline.run()
+            completed = True
+        finally:
+            self.finish_load_report('init', checkpoints, completed)
 
-        for api in self.apis:
-            self.build_material_storage_size(api)
-            self.build_inventory(api)
-            self.accounts.append(api.account_name())
-
-        self.build_recipe_info(self.apis[0])
-        self.build_item_info(self.apis[0])
-        self.build_ecto_price(self.apis[0])
         self.is_ready = True
 
+    def report_progress(self, stage: str, message: str, account: str = None, done: int = 0, total: int = 1) -> None:
+        self.messaging.progress(ProgressEvent(stage, account, done, total, self.timer.elapsed(), message))
+
+    def stage_done(self, name: str, done: int, total: int) -> None:
+        self.report_progress('load', f"Finished {done} of {total} loading steps", done=done, total=total)
+
+    def stats_checkpoints(self) -> list:
+        return [(client, client.stats.checkpoint()) for client in self.apis + [self.catalog]]
+
+    def finish_load_report(self, kind: str, checkpoints: list, completed: bool) -> None:
+        # clients live longer than single load, only requests done since load started are reported
+        stats = RequestStats()
+        for client, checkpoint in checkpoints:
+            stats.add(client.stats.since(checkpoint))
+        self.load_report = LoadReport(kind, time.time(), self.timer.elapsed(), completed, list(self.timer.stages),
+                                      stats.report())
+        for line in self.load_report.summary():
+            logger.info(line)
+
+    def build_account(self, api: GW2Api) -> None:
+        self.build_material_storage_size(api)
+        self.build_inventory(api)
+
+    def use_catalog(self) -> None:
+        if self.catalog is None:
+            self.catalog = shared_catalog()
+        self.catalog.aborted = False
+
     def abort(self) -> None:
         for api in self.apis:
             api.abort()
+        if self.catalog:
+            self.catalog.abort()
         self.aborted = True
         self.is_ready = True
         self.items = dict()
+        self.next_generation()
+
+    def close(self) -> None:
+        # catalog is shared by all models, only clients of accounts are closed
+        for api in self.apis:
+            api.close()
 
     def add_item(self, item_id: int, account_bound: bool, source: Source) -> None:
         if item_id not in self.items:
@@ -68,53 +186,246 @@ class Model(Listener):
         self.items[item_id].account_bound = account_bound
 
     def has_item(self, item_id: int) -> bool:
-        return item_id in self.items.keys() and self.items[item_id].total_count() > 0
+        return self.counts.has_item(item_id)
+
+    def build_count_index(self) -> None:
+        with self.lock:
+            self.counts = CountIndex(self.items, self.accounts)
 
     def build_material_storage_size(self, api: GW2Api) -> None:
+        with self.timer.stage(f'materials@{api.account_name()}'):
+            self.material_storage_size[api.account_name()] = self.storage_size(api.material_storage())
+
+    @staticmethod
+    def storage_size(materials: list) -> int:
         max_count = 0
-        for material in api.material_storage():
+        for material in materials:
             max_count = max(max_count, material['count'])
-        self.material_storage_size[api.account_name()] = ceil(max_count / 250) * 250
+        return ceil(max_count / stack_size) * stack_size
 
     @staticmethod
     def is_account_bound(item):
         return 'Account' == item.get('binding', None)
 
-    def build_inventory(self, api: GW2Api) -> None:
-        self.empty_slots = 0
-
-        self.messaging.broadcast(f"Loading characters@{api.account_name()}")
-        for character_name in api.characters():
-            self.messaging.broadcast(f"Loading character {character_name}@{api.account_name()}")
-            for bag in api.character_inventory(character_name)['bags']:
-                if bag is not None:
-                    for item in bag['inventory']:
-                        if item is not None:
-                            self.add_item(item['id'], self.is_account_bound(item),
-                                          Source(item['count'], character_name, api.account_name()))
-                        else:
-                            self.empty_slots = self.empty_slots + 1
-
-        self.messaging.broadcast(f"Loading material storage@{api.account_name()}")
-        for material in api.material_storage():
-            self.add_item(material['id'], self.is_account_bound(material),
-                          Source(material['count'], "$storage", api.account_name()))
-
-        self.messaging.broadcast(f"Loading bank@{api.account_name()}")
-        for item in api.bank():
+    def collect_slots(self, slots: list, place: str, account: str, account_items: list) -> int:
+        empty_slots = 0
+        for item in slots:
             if item is not None:
-                self.add_item(item['id'], self.is_account_bound(item),
-                              Source(item['count'], "$bank", api.account_name()))
+                account_bound = self.is_account_bound(item)
+                account_items.append((item['id'], account_bound, Source(item['count'], place, account,
+                                                                        account_bound=account_bound)))
             else:
-                self.empty_slots = self.empty_slots + 1
+                empty_slots = empty_slots + 1
+        return empty_slots
 
-        self.messaging.broadcast(f"Loading shared slots@{api.account_name()}")
-        for item in api.shared_slots():
-            if item is not None:
-                self.add_item(item['id'], self.is_account_bound(item),
-                              Source(item['count'], "$shared_slot", api.account_name()))
+    def collect_character(self, inventory: dict, character_name: str, account: str, account_items: list) -> int:
+        empty_slots = 0
+        for bag in inventory['bags']:
+            if bag is not None:
+                empty_slots = empty_slots + self.collect_slots(bag['inventory'], character_name, account, account_items)
+        return empty_slots
+
+    @staticmethod
+    def character_signature(inventory: dict) -> dict:
+        return {'age': inventory['age'], 'last_modified': inventory['last_modified']}
+
+    def build_inventory(self, api: GW2Api) -> None:
+        account = api.account_name()
+        account_items: list[tuple[int, bool, Source]] = []
+        empty_slots: dict[str, int] = dict()
+
+        self.report_progress('characters', f"Loading characters@{account}", account)
+        with self.timer.stage(f'characters@{account}'):
+            inventories = api.characters_inventories()
+            for done, (character_name, inventory) in enumerate(inventories.items()):
+                self.report_progress('characters', f"Loading character {character_name}@{account}", account, done,
+                                     len(inventories))
+                empty_slots[character_name] = self.collect_character(inventory, character_name, account,
+                                                                     account_items)
+
+        self.report_progress('materials', f"Loading material storage@{account}", account)
+        self.collect_slots(api.material_storage(), "$storage", account, account_items)
+
+        self.report_progress('bank', f"Loading bank@{account}", account)
+        with self.timer.stage(f'bank@{account}'):
+            empty_slots["$bank"] = self.collect_slots(api.bank(), "$bank", account, account_items)
+
+        self.report_progress('shared_slots', f"Loading shared slots@{account}", account)
+        with self.timer.stage(f'shared_slots@{account}'):
+            empty_slots["$shared_slot"] = self.collect_slots(api.shared_slots(), "$shared_slot", account,
+                                                             account_items)
+
+        # whole account is merged at once, by its merge stage
+        def merge() -> str:
+            for item_id, account_bound, source in account_items:
+                self.add_item(item_id, account_bound, source)
+            self.empty_slots_by_place[account] = empty_slots
+            self.empty_slots = self.count_empty_slots()
+            self.character_states[account] = {character_name: self.character_signature(inventory)
+                                              for character_name, inventory in inventories.items()}
+            self.loaded_accounts = self.loaded_accounts + 1
+            return f"Loaded account {account} ({self.loaded_accounts}/{len(self.apis)})"
+
+        self.pending_merges[api] = merge
+
+    def count_empty_slots(self) -> int:
+        return sum(sum(empty_slots.values()) for empty_slots in self.empty_slots_by_place.values())
+
+    def can_refresh(self) -> bool:
+        # refresh patches previous load, it needs to be complete and done with same accounts
+        return self.is_ready and not self.aborted and len(self.character_states) == len(self.apis) > 0
+
+    def refresh_from_api(self) -> None:
+        if not self.can_refresh():
+            self.init_from_api()
+            return
+
+        self.next_generation()
+        self.use_catalog()
+        for api in self.apis:
+            api.aborted = False
+        self.timer = LoadTimer()
+        checkpoints = self.stats_checkpoints()
+        self.is_ready = False
+        self.refreshed_places = 0
+        self.pending_merges = dict()
+
+        pipeline = LoadPipeline(len(self.apis) + pipeline_workers, self.timer, self.stage_done)
+        refresh_stages = self.add_account_stages(pipeline, 'refresh', self.refresh_account)
+        pipeline.add('counts', self.build_count_index, refresh_stages)
+        pipeline.add('item_info', self.build_item_info, refresh_stages)
+        pipeline.add('recipes', self.build_recipe_info, ['counts'])
+        pipeline.add('prices', self.build_prices, ['item_info'])
+        # ecto price is not refreshed, it is kept from last load
+        self.add_advice_stages(pipeline, {'ecto_price': []})
+
+        self.report_progress('load', "Loading account data", done=0, total=len(pipeline.stages))
+        completed = False
+        try:
+            pipeline.run()
+            completed = True
+        finally:
+            self.finish_load_report('refresh', checkpoints, completed)
+
+        logger.info(f"Refreshed {self.refreshed_places} changed places")
+        self.is_ready = True
+
+    def add_account_stages(self, pipeline: LoadPipeline, name: str, action: Callable[[GW2Api], None]) -> list[str]:
+        # accounts load in parallel, but are merged in order of api list, so last binding of item seen does not
+        # depend on which account loaded first
+        merge_stages = []
+        for index, api in enumerate(self.apis):
+            pipeline.add(f'{name}#{index}', lambda api=api: action(api))
+            pipeline.add(f'merge#{index}', lambda api=api: self.merge_account(api),
+                         [f'{name}#{index}'] + merge_stages[-1:])
+            merge_stages.append(f'merge#{index}')
+        return merge_stages
+
+    def merge_account(self, api: GW2Api) -> None:
+        merge = self.pending_merges.pop(api)
+        with self.lock:
+            message = merge()
+        self.messaging.broadcast(message)
+
+    def add_advice_stages(self, pipeline: LoadPipeline, stage_names: dict[str, list[str]]) -> None:
+        for index, (inputs, categories) in enumerate(advice_publishing):
+            depends_on = [stage for kind in inputs for stage in stage_names.get(kind, [kind])]
+            pipeline.add(f'advice#{index}', lambda categories=categories: self.publish_advice(categories), depends_on)
+
+    def refresh_account(self, api: GW2Api) -> None:
+        account = api.account_name()
+        # only places which changed since last load are replaced
+        changed_places: set[str] = set()
+        account_items: list[tuple[int, bool, Source]] = []
+        empty_slots = dict(self.empty_slots_by_place[account])
+        previous_states = self.character_states[account]
+        character_states = previous_states
+
+        self.report_progress('characters', f"Checking characters@{account}", account)
+        inventories = api.characters_inventories_if_changed(previous_states)
+        if inventories is not None:
+            # states follow current order of characters, as in full load
+            character_states = dict()
+            for character_name in previous_states.keys() - inventories.keys():
+                # deleted character
+                changed_places.add(character_name)
+                empty_slots.pop(character_name, None)
+            for character_name, inventory in inventories.items():
+                # unchanged characters are None only when checked one by one by age and last modification, bulk
+                # page sent again has current bags of every character, even if those two did not change
+                if inventory is None:
+                    character_states[character_name] = previous_states[character_name]
+                    continue
+                changed_places.add(character_name)
+                empty_slots[character_name] = self.collect_character(inventory, character_name, account,
+                                                                     account_items)
+                character_states[character_name] = self.character_signature(inventory)
+
+        self.report_progress('materials', f"Checking material storage@{account}", account)
+        materials = api.account_data_if_changed('/v2/account/materials')
+        if materials is not None:
+            changed_places.add("$storage")
+            self.collect_slots(materials, "$storage", account, account_items)
+
+        self.report_progress('bank', f"Checking bank@{account}", account)
+        bank = api.account_data_if_changed('/v2/account/bank')
+        if bank is not None:
+            changed_places.add("$bank")
+            empty_slots["$bank"] = self.collect_slots(bank, "$bank", account, account_items)
+
+        self.report_progress('shared_slots', f"Checking shared slots@{account}", account)
+        shared_slots = api.account_data_if_changed('/v2/account/inventory')
+        if shared_slots is not None:
+            changed_places.add("$shared_slot")
+            empty_slots["$shared_slot"] = self.collect_slots(shared_slots, "$shared_slot", account, account_items)
+
+        def merge() -> str:
+            changed_item_ids = self.remove_sources(account, changed_places) if changed_places else set()
+            for item_id, account_bound, source in account_items:
+                self.add_item(item_id, account_bound, source)
+                changed_item_ids.add(item_id)
+            if "$storage" in changed_places:
+                self.material_storage_size[account] = self.storage_size(materials)
+            self.empty_slots_by_place[account] = empty_slots
+            self.empty_slots = self.count_empty_slots()
+            self.character_states[account] = character_states
+            self.restore_source_order(changed_item_ids)
+            self.refreshed_places = self.refreshed_places + len(changed_places)
+            return f"Refreshed account {account} ({len(changed_places)} places changed)"
+
+        self.pending_merges[api] = merge
+
+    def remove_sources(self, account: str, places: set[str]) -> set[int]:
+        changed_item_ids = set()
+        for item_id in list(self.items.keys()):
+            item = self.items[item_id]
+            sources = [source for source in item.sources if source.account != account or source.place not in places]
+            if len(sources) == len(item.sources):
+                continue
+            item.sources = sources
+            if sources:
+                changed_item_ids.add(item_id)
             else:
-                self.empty_slots = self.empty_slots + 1
+                # item is gone, if it ever comes back, it needs its details again
+                del self.items[item_id]
+                self.described_item_ids.discard(item_id)
+        return changed_item_ids
+
+    def restore_source_order(self, item_ids: set[int]) -> None:
+        # refreshed places were added at end, sources are put back in order of full load: accounts in order of
+        # api list, characters in order of api, then storage, bank and shared slots; item then takes binding of
+        # its last source, as full load does
+        account_ranks = {account: rank for rank, account in enumerate(self.accounts)}
+        place_ranks = {account: {place: rank for rank, place in enumerate(
+            list(character_states.keys()) + ["$storage", "$bank", "$shared_slot"])}
+            for account, character_states in self.character_states.items()}
+        for item_id in item_ids:
+            item = self.items.get(item_id, None)
+            if item is None:
+                continue
+            item.sources.sort(key=lambda source: (account_ranks.get(source.account, 0),
+                                                  place_ranks.get(source.account, dict()).get(source.place, 0)))
+            item.account_bound = item.sources[-1].account_bound
 
     @staticmethod
     def build_basic_item_info(item: Item, item_info):
@@ -134,43 +445,38 @@ class Model(Listener):
 
         item.wiki_link = f"https://wiki.guildwars2.com/wiki/{item_info['name'].replace(' ', '_')}"
 
-    def build_recipe_info(self, api: GW2Api) -> None:
-        self.messaging.broadcast("Loading crafting recipes")
-        recipes = api.recipes()
-
-        output_item_ids = []
-
-        for recipe in recipes:
-            if recipe['type'] in ["Refinement", "RefinementEctoplasm", "RefinementObsidian", "IngredientCooking"]:
-                valid = True
-                for ingredient in recipe['ingredients']:
-                    if ingredient['type'] == "Item" and not self.has_item(ingredient['id']):
-                        valid = False
-                        break
-                    if ingredient['type'] == "Item" and self.items[ingredient['id']].total_count() < ingredient[
-                        'count']:
-                        valid = False
-                        break
-                if valid:
-                    self.recipes.append(recipe)
-                    output_item_ids.append(recipe['output_item_id'])
-
-        self.messaging.broadcast("Loading crafted items details")
+    def build_recipe_info(self) -> None:
+        self.report_progress('recipes', "Loading crafting recipes")
+        # craft advice needs at least one ingredient over full stack, other recipes do not matter
+        ingredient_ids = frozenset(self.counts.items_over(stack_size))
+        if len(ingredient_ids) <= recipe_search_max_ingredients:
+            recipes = self.catalog.recipes_using(ingredient_ids)
+        else:
+            recipes = self.catalog.recipes()
+
+        self.recipe_engine = RecipeEngine(recipes)
+        self.recipes = self.recipe_engine.valid_recipes(self.counts)
+        output_item_ids = [recipe['output_item_id'] for recipe in self.recipes]
+
+        self.report_progress('recipes', "Loading crafted items details")
 
         self.recipe_results: dict[int, Item] = dict()
 
-        for item_info in api.item_info(frozenset(output_item_ids)):
+        for item_info in self.catalog.item_info(frozenset(output_item_ids)):
             item: Item = Item(item_info['id'])
 
             self.build_basic_item_info(item, item_info)
 
             self.recipe_results[item_info['id']] = item
 
-    def build_item_info(self, api: GW2Api) -> None:
-        appraise_item_ids = []
-        self.messaging.broadcast("Loading item details")
+    def build_item_info(self) -> None:
+        self.report_progress('item_info', "Loading item details")
+
+        with self.lock:
+            item_ids = frozenset(self.items.keys() - self.described_item_ids)
+            self.described_item_ids.update(item_ids)
 
-        for item_info in api.item_info(frozenset(self.items.keys())):
+        for item_info in self.catalog.item_info(item_ids):
             item: Item = self.items.get(item_info['id'])
 
             self.build_basic_item_info(item, item_info)
@@ -192,16 +498,18 @@ class Model(Listener):
             if item_info['type'] in ['Armor', 'Back', 'Trinket', 'Weapon'] and item_info['rarity'] == 'Rare' and \
                     item_info['level'] > 77 and 'NoSalvage' not in item_info['flags'] and 'AccountBound' not in item_info['flags']:
                 item.rare_for_salvage = True
-                appraise_item_ids.append(item.item_id)
 
-        self.messaging.broadcast("Loading market prices")
-        for price in api.item_prices(frozenset(appraise_item_ids)):
+    def build_prices(self) -> None:
+        appraise_item_ids = [item.item_id for item in self.items.values() if item.rare_for_salvage]
+
+        self.report_progress('prices', "Loading market prices")
+        for price in self.catalog.item_prices(frozenset(appraise_item_ids)):
             self.items[price['id']].price = price['sells']['unit_price']
 
-    def build_ecto_price(self, api: GW2Api) -> None:
+    def build_ecto_price(self) -> None:
 
-        self.messaging.broadcast("Loading ecto price")
-        price = api.item_price(19721)
+        self.report_progress('ecto_price', "Loading ecto price")
+        price = self.catalog.item_price(19721)
 
         salvage_price = 0.10496
         ecto_chance = 0.875
@@ -209,260 +517,61 @@ class Model(Listener):
 
         self.ecto_salvage_price = (price['sells']['unit_price'] * tp_tax * ecto_chance - salvage_price) / tp_tax
 
-    @lru_cache(maxsize=None)
+    def publish_advice(self, categories: tuple) -> None:
+        generation = self.generation
+        report = AdviceEngine(self, categories=categories).evaluate()
+        with self.lock:
+            if generation != self.generation:
+                # load was aborted or restarted meanwhile
+                return
+            for category in categories:
+                self.advice_cache.put(generation, category, getattr(report, category))
+            self.ready_advice.update(categories)
+        for category in categories:
+            self.messaging.advice_ready(category)
+
+    def is_advice_ready(self, category: str) -> bool:
+        return category in self.ready_advice
+
+    def get_advice(self, category: str) -> list[ItemForDisplay]:
+        if not self.is_advice_ready(category):
+            return []
+        return self.advice_cache.get_or_compute(
+            self.generation, category,
+            lambda: getattr(AdviceEngine(self, categories=(category,)).evaluate(), category))
+
     def get_advice_stacks(self) -> list[ItemForDisplay]:
-        stack_advice: list[ItemForDisplay] = []
-        for item in filter(lambda list_item: len(list_item.get_advice_stacks(self.material_storage_size)) > 0,
-                           self.items.values()):
-            stack_advice.append(ItemForDisplay(item, sources=item.get_advice_stacks(self.material_storage_size)))
-        return stack_advice
+        return self.get_advice('stacks')
 
-    @lru_cache(maxsize=None)
     def get_vendor_advice(self) -> list[ItemForDisplay]:
-        junk: list[ItemForDisplay] = []
-        for item in filter(lambda list_item: list_item.rarity == 'Junk', self.items.values()):
-            junk.append(ItemForDisplay(item))
-        return junk
+        return self.get_advice('vendor')
 
-    @lru_cache(maxsize=None)
     def get_rare_salvage_advice(self) -> list[ItemForDisplay]:
-        rare_salvage_advice = []
-        for item in filter(lambda list_item: list_item.rare_for_salvage, self.items.values()):
-            if not item.price is None:
-                if item.price > self.ecto_salvage_price:
-                    rare_salvage_advice.append(ItemForDisplay(item, advice='Salvage!'))
-                else:
-                    if not item.account_bound:
-                        rare_salvage_advice.append(ItemForDisplay(item, advice='Sell!'))
-        return rare_salvage_advice
-
-    @lru_cache(maxsize=None)
-    def get_craft_luck_advice(self) -> list[ItemForDisplay]:
-
-        luck_items = [45175, 45176, 45177]
-
-        luck_items_advice: list[ItemForDisplay] = []
+        return self.get_advice('rare_salvage')
 
-        for luck_item_id in luck_items:
-            for account in self.accounts:
-                if self.has_item(luck_item_id) and self.items[luck_item_id].total_count(account) > 250:
-                    luck_items_advice.append(ItemForDisplay(self.items[luck_item_id],
-                                                            sources=self.items[luck_item_id].get_sources_for_account(
-                                                                account)))
-
-        return luck_items_advice
+    def get_craft_luck_advice(self) -> list[ItemForDisplay]:
+        return self.get_advice('craft_luck')
 
-    @lru_cache(maxsize=None)
     def get_advice_just_delete(self) -> list[ItemForDisplay]:
-        just_delete_advice = []
-        for item in filter(lambda list_item: list_item.deletable, self.items.values()):
-            just_delete_advice.append(ItemForDisplay(item))
-        return just_delete_advice
+        return self.get_advice('just_delete')
 
-    @lru_cache(maxsize=None)
     def get_just_salvage_advice(self) -> list[ItemForDisplay]:
-        just_salvage_advice: list[ItemForDisplay] = []
-
-        exclude = [19721]  # ecto
+        return self.get_advice('just_salvage')
 
-        for item in filter(
-                lambda list_item: list_item.description == "Salvage Item" and list_item.item_id not in exclude,
-                self.items.values()):
-            just_salvage_advice.append(ItemForDisplay(item, advice="Salvage this item"))
-        return just_salvage_advice
-
-    @lru_cache(maxsize=None)
     def get_play_to_consume_advice(self) -> list[ItemForDisplay]:
+        return self.get_advice('play_to_consume')
 
-        gameplay_consumables = {
-            78758: "Trade to get bounty for bandit leader.",
-            78886: "Have in inventory while defeating a bandit leader to spawn the Legendary Bandit Executioner",
-            84335: "Use during a treasure hunt meta in Desert Highlands to spawn chests",
-            67826: "Use in the Silverwastes after a meta completes to spawn chests. Make sure you have required keys.",
-            67979: "Open a greater nightmare pod in the Silverwastes after completing meta.",
-            67818: "Use during breach event in Silverwastes.",
-            67780: "Open Tarnished chest in Silverwastes.",
-            87517: "Open krait Sunken Chests to progress a Master Diver achievement.",
-            48716: "Open chests in the Aetherpath of the Twilight Arbor dungeon.",
-
-            78782: "Complete this bounty.",
-            78754: "Complete this bounty.",
-            78786: "Complete this bounty.",
-            78784: "Complete this bounty.",
-            78781: "Complete this bounty.",
-            78883: "Complete this bounty.",
-            78859: "Complete this bounty.",
-            78988: "Complete this bounty.",
-            78867: "Complete this bounty.",
-            78954: "Complete this bounty.",
-
-            71627: "Complete events in the Verdant Brink.",
-            75024: "Complete events in the Auric Basin.",
-            71207: "Complete events in the Tangled Depths.",
-
-            87630: "Contribute Spare Parts to kick off meta event in the Domain of Kourna.",
-
-            93407: "Use in the Drizzlewood Coast to spawn chests. Make sure you have required keys.",
-
-            93371: "Use to unlock achievements (and play in Drizzlewood Coast)",
-            93817: "Use to unlock achievements (and play  Drizzlewood Coast), or just delete/tp when you are done.",
-            93842: "Use to unlock achievements (and play  Drizzlewood Coast), or just delete/tp when you are done.",
-            93799: "Use to unlock achievements (and play  Drizzlewood Coast), or just delete/tp when you are done.",
-
-        }
-
-        play_to_consume_advices: list[ItemForDisplay] = []
-
-        for item_id in gameplay_consumables.keys():
-            if self.has_item(item_id):
-                play_to_consume_advices.append(
-                    ItemForDisplay(self.items[item_id], advice=gameplay_consumables[item_id]))
-
-        return play_to_consume_advices
-
-    @lru_cache(maxsize=None)
     def get_gobbler_advice(self) -> list[ItemForDisplay]:
+        return self.get_advice('gobbler')
 
-        gobbles = [
-
-            Gobble(46731, 77093, 250),  # Herta
-            Gobble(46731, 66999, 50),  # Mawdrey
-            Gobble(46733, 69887, 50),  # Princess
-            Gobble(46735, 68369, 50),  # Star
-
-            Gobble(83103, 83305, 25),  # Spearmarshall
-        ]
-
-        active_gobblers: list[ItemForDisplay] = []
-
-        for gobble in gobbles:
-            if self.has_item(gobble.item_id) and self.has_item(gobble.gobbler_item_id):
-                for account in self.accounts:
-                    if self.items[gobble.item_id].total_count(account) > self.material_storage_size[account]:
-                        active_gobblers.append(ItemForDisplay(self.items[gobble.gobbler_item_id], sources=self.items[
-                            gobble.gobbler_item_id].get_sources_for_account(account)))
-
-        return active_gobblers
-
-    @lru_cache(maxsize=None)
     def get_misc_advice(self) -> list[ItemForDisplay]:
+        return self.get_advice('misc')
 
-        misc = [
-            MiscAdvice(43773, 25, "Transform Quartz Crystals into a Charged Quartz Crystal at a place of power."),
-            MiscAdvice(66608, 100, "Sift through silky sand."),
-            MiscAdvice(48717, 4, "Craft 'Completed Aetherkey'."),
-            MiscAdvice(93472, 1, "Consume to get War Supplies"),
-            MiscAdvice(93649, 1, "Consume to get War Supplies"),
-            MiscAdvice(93455, 1, "Consume to get War Supplies"),
-            MiscAdvice(68531, 1, "Consume to get Mordrem parts which can be exchanged for map currency"),
-            MiscAdvice(39752, 250, "Convert to Bauble Bubble"),
-            MiscAdvice(36041, 1000, "Convert to Candy Corn Cob"),
-            MiscAdvice(43319, 1000, "Convert to Jorbreaker"),
-
-        ]
-
-        misc_advices: list[ItemForDisplay] = []
-
-        for advice in misc:
-            if self.has_item(advice.item_id) and self.items[advice.item_id].total_count() >= advice.min_size:
-                misc_advices.append(ItemForDisplay(self.items[advice.item_id], advice=advice.text))
-
-        return misc_advices
-
-    @lru_cache(maxsize=None)
     def get_karma_consumables_advice(self) -> list[ItemForDisplay]:
+        return self.get_advice('karma_consumables')
 
-        karma_item_ids = [86336, 85790, 41740, 38030, 86374, 86181, 36448, 36449, 92714, 95765, 36450, 36451, 41738,
-                          36456, 77652, 36457, 36458, 36459, 36460, 70244, 69939, 39127, 41373, 36461]
-
-        misc_advices = []
-
-        for item_id in karma_item_ids:
-            if self.has_item(item_id) and self.items[item_id].total_count() > 0:
-                misc_advices.append(ItemForDisplay(self.items[item_id], advice="Consume to get karma."))
-
-        return misc_advices
-
-    @lru_cache(maxsize=None)
     def get_ls3ls4ibs_advice(self) -> list[ItemForDisplay]:
+        return self.get_advice('ls3ls4ibs')
 
-        ls3ls4ibs_advice: list[ItemForDisplay] = []
-
-        ls3_items = [79280, 79469, 79899, 80332, 81127, 81706]
-
-        for ls3_item_id in ls3_items:
-            for account in self.accounts:
-                if self.has_item(ls3_item_id) and self.items[ls3_item_id].total_count(account) > \
-                        self.material_storage_size[account]:
-                    ls3ls4ibs_advice.append(ItemForDisplay(self.items[ls3_item_id],
-                                                           advice='Consume to get Unboud magic',
-                                                           sources=self.items[ls3_item_id].get_sources_for_account(
-                                                               account)))
-
-        ls4_items = [86069, 86977, 87645, 88955, 89537, 90783]
-
-        for ls4_item_id in ls4_items:
-            for account in self.accounts:
-                if self.has_item(ls4_item_id) and self.items[ls4_item_id].total_count(account) > \
-                        self.material_storage_size[account]:
-                    ls3ls4ibs_advice.append(ItemForDisplay(self.items[ls4_item_id],
-                                                           advice='Consume to get Volatile magic',
-                                                           sources=self.items[ls4_item_id].get_sources_for_account(
-                                                               account)))
-
-        eternal_ice_shard_id = 92272
-
-        for account in self.accounts:
-            if self.has_item(eternal_ice_shard_id) and self.items[eternal_ice_shard_id].total_count(account) > \
-                    self.material_storage_size[
-                        account]:
-                ls3ls4ibs_advice.append(ItemForDisplay(self.items[eternal_ice_shard_id],
-                                                       advice='Convert to LS4 currency',
-                                                       sources=self.items[eternal_ice_shard_id].get_sources_for_account(
-                                                           account)))
-
-        return ls3ls4ibs_advice
-
-    @lru_cache(maxsize=None)
     def get_craft_advice(self) -> list[ItemForDisplay]:
-
-        craft_advice: list[ItemForDisplay] = []
-
-        for recipe in self.recipes:
-            if recipe['output_item_id'] not in self.recipe_results:
-                # recipe has invalid item id output, it was not returned in items, not a valid recipe
-                continue
-
-            has_account_bound_ingredient = False
-
-            for ingredient in recipe['ingredients']:
-                if ingredient['type'] == "Item" and self.items[ingredient['id']].account_bound:
-                    has_account_bound_ingredient = True
-                    break
-
-            if has_account_bound_ingredient:
-                for account in self.accounts:
-                    can_craft = True
-                    has_more_than_stack_ingredient = False
-                    for ingredient in recipe['ingredients']:
-                        if ingredient['type'] == "Item" and self.items[ingredient['id']].total_count(account) < \
-                                ingredient['count']:
-                            can_craft = False
-                        if ingredient['type'] == "Item" and self.items[ingredient['id']].total_count(account) > 250:
-                            has_more_than_stack_ingredient = True
-                    if can_craft and has_more_than_stack_ingredient:
-                        craft_advice.append(
-                            ItemForDisplay(self.recipe_results[recipe['output_item_id']], advice="Craft"))
-            else:
-                can_craft = True
-                has_more_than_stack_ingredient = False
-                for ingredient in recipe['ingredients']:
-                    if ingredient['type'] == "Item" and self.items[ingredient['id']].total_count() < ingredient[
-                        'count']:
-                        can_craft = False
-                    if ingredient['type'] == "Item" and self.items[ingredient['id']].total_count() > 250:
-                        has_more_than_stack_ingredient = True
-                if can_craft and has_more_than_stack_ingredient:
-                    craft_advice.append(ItemForDisplay(self.recipe_results[recipe['output_item_id']], advice="Craft"))
-
-        return craft_advice
+        return self.get_advice('craft')
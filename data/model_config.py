@@ -1,14 +1,107 @@
-from dataclasses import dataclass
+import json
+import os.path
+from dataclasses import dataclass, fields, MISSING
+from types import MappingProxyType
+from typing import Mapping
 
+ADVICE_RULES_FILE = os.path.join(os.path.dirname(__file__), 'advice_rules.json')
 
-@dataclass
+
+class InvalidAdviceRules(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ItemRule:
+    item_id: int
+
+
+@dataclass(frozen=True)
+class ItemAdvice:
+    item_id: int
+    text: str
+
+
+@dataclass(frozen=True)
 class Gobble:
     item_id: int
     gobbler_item_id: int
     gobble_size: int
 
-@dataclass
+@dataclass(frozen=True)
 class MiscAdvice:
     item_id: int
     min_size: int
-    text: str
\ No newline at end of file
+    text: str
+
+
+# item id -> (order of rule in file, rule) for every rule about that item
+CompiledRules = Mapping[int, tuple[tuple[int, object], ...]]
+
+
+@dataclass(frozen=True)
+class AdviceRules:
+    craft_luck: CompiledRules
+    just_salvage_exclude: CompiledRules
+    play_to_consume: CompiledRules
+    gobbler: CompiledRules
+    misc: CompiledRules
+    karma_consumables: CompiledRules
+    ls3ls4ibs: CompiledRules
+
+
+rule_types = {
+    'craft_luck': ItemRule,
+    'just_salvage_exclude': ItemRule,
+    'play_to_consume': ItemAdvice,
+    'gobbler': Gobble,
+    'misc': MiscAdvice,
+    'karma_consumables': ItemRule,
+    'ls3ls4ibs': ItemAdvice,
+}
+
+
+def compile_rules(category: str, rule_type: type, entries) -> CompiledRules:
+    if not isinstance(entries, list):
+        raise InvalidAdviceRules(f'Advice rules {category} must be a list')
+
+    compiled: dict[int, list] = dict()
+    rule_fields = {rule_field.name: rule_field for rule_field in fields(rule_type)}
+    for order, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise InvalidAdviceRules(f'Advice rule {category}[{order}] must be an object')
+        # comment is for people editing rules
+        values = {key: value for key, value in entry.items() if key != 'comment'}
+        for key, value in values.items():
+            if key not in rule_fields:
+                raise InvalidAdviceRules(f'Advice rule {category}[{order}] has unknown field {key}')
+            if not isinstance(value, rule_fields[key].type) or isinstance(value, bool):
+                raise InvalidAdviceRules(
+                    f'Advice rule {category}[{order}] field {key} must be {rule_fields[key].type.__name__}')
+        for rule_field in rule_fields.values():
+            if rule_field.name not in values and rule_field.default is MISSING:
+                raise InvalidAdviceRules(f'Advice rule {category}[{order}] is missing field {rule_field.name}')
+        rule = rule_type(**values)
+        compiled.setdefault(rule.item_id, []).append((order, rule))
+
+    return MappingProxyType({item_id: tuple(rules) for item_id, rules in compiled.items()})
+
+
+def load_advice_rules(file_name: str = ADVICE_RULES_FILE) -> AdviceRules:
+    try:
+        with open(file_name, 'r', encoding='utf-8') as in_file:
+            json_data = json.load(in_file)
+    except (OSError, ValueError) as ex:
+        raise InvalidAdviceRules(f'Advice rules {file_name} can not be read, error: ({ex})')
+
+    if not isinstance(json_data, dict):
+        raise InvalidAdviceRules(f'Advice rules {file_name} must be an object')
+    for category in json_data.keys():
+        if category not in rule_types:
+            raise InvalidAdviceRules(f'Advice rules {file_name} have unknown category {category}')
+
+    return AdviceRules(**{category: compile_rules(category, rule_type, json_data.get(category, []))
+                          for category, rule_type in rule_types.items()})
+
+
+advice_rules = load_advice_rules()
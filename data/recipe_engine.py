@@ -0,0 +1,75 @@
+from array import array
+
+from data.count_index import CountIndex
+from data.source import stack_size
+
+# only recipes turning stacks of ingredients into something else are interesting
+refinement_recipe_types = ["Refinement", "RefinementEctoplasm", "RefinementObsidian", "IngredientCooking"]
+
+
+class RecipeEngine:
+
+    def __init__(self, recipes: list[dict]):
+        self.recipes: list[dict] = []
+        self.output_item_ids = array('q')
+        # ingredients of recipe i are at ingredient_offsets[i]:ingredient_offsets[i + 1]
+        self.ingredient_offsets = array('q', [0])
+        self.ingredient_ids = array('q')
+        self.ingredient_counts = array('q')
+        # item id -> indexes of recipes using it
+        self.by_ingredient: dict[int, list[int]] = dict()
+
+        for recipe in recipes:
+            if recipe['type'] not in refinement_recipe_types:
+                continue
+            index = len(self.recipes)
+            self.recipes.append(recipe)
+            self.output_item_ids.append(recipe['output_item_id'])
+            for ingredient in recipe['ingredients']:
+                # currencies and guild upgrades are not in inventory
+                if ingredient['type'] == "Item":
+                    self.ingredient_ids.append(ingredient['id'])
+                    self.ingredient_counts.append(ingredient['count'])
+                    self.by_ingredient.setdefault(ingredient['id'], []).append(index)
+            self.ingredient_offsets.append(len(self.ingredient_ids))
+
+    def ingredients(self, index: int) -> range:
+        return range(self.ingredient_offsets[index], self.ingredient_offsets[index + 1])
+
+    def can_craft(self, index: int, counts: CountIndex, account: str = None) -> bool:
+        for i in self.ingredients(index):
+            if counts.total(self.ingredient_ids[i], account) < self.ingredient_counts[i]:
+                return False
+        return True
+
+    def has_over_stack_ingredient(self, index: int, counts: CountIndex, account: str = None) -> bool:
+        for i in self.ingredients(index):
+            if counts.total(self.ingredient_ids[i], account) > stack_size:
+                return True
+        return False
+
+    def valid_recipes(self, counts: CountIndex) -> list[dict]:
+        valid_recipes = []
+        for index, recipe in enumerate(self.recipes):
+            if self.can_craft(index, counts):
+                valid_recipes.append(recipe)
+        return valid_recipes
+
+    def over_stack_candidates(self, counts: CountIndex) -> list[int]:
+        # per account count over stack means total count over stack too, so this covers accounts as well
+        candidates = set()
+        for item_id in counts.items_over(stack_size):
+            candidates.update(self.by_ingredient.get(item_id, []))
+        return sorted(candidates)
+
+    def craft_advice(self, counts: CountIndex, account_bound_item_ids: set[int]) -> list[int]:
+        output_item_ids = []
+        for index in self.over_stack_candidates(counts):
+            if any(self.ingredient_ids[i] in account_bound_item_ids for i in self.ingredients(index)):
+                for account in counts.accounts:
+                    if self.can_craft(index, counts, account) and \
+                            self.has_over_stack_ingredient(index, counts, account):
+                        output_item_ids.append(self.output_item_ids[index])
+            elif self.can_craft(index, counts) and self.has_over_stack_ingredient(index, counts):
+                output_item_ids.append(self.output_item_ids[index])
+        return output_item_ids
@@ -0,0 +1,88 @@
+import gzip
+import json
+import os
+import time
+
+from data.advice_engine import advice_categories
+from data.count_index import CountIndex
+from data.item import Item
+from data.recipe_engine import RecipeEngine
+from data.source import Source
+
+SNAPSHOT_FILE = 'gw2_last_load.json.gz'
+
+# bump when layout of snapshot changes, older snapshots are then refused
+snapshot_version = 1
+
+
+class InvalidSnapshot(Exception):
+
+    def __init__(self, file_name: str, reason: str):
+        super().__init__(f'{file_name}: {reason}')
+        self.file_name = file_name
+        self.reason = reason
+
+
+def item_to_row(item: Item) -> list:
+    return [item.item_id, item.name, item.description, item.icon, item.rarity, item.wiki_link, item.account_bound,
+            item.stackable, item.deletable, item.rare_for_salvage, item.price,
+            [[source.count, source.place, source.account, source.slots, source.partial_count, source.partial_slots]
+             for source in item.sources]]
+
+
+def item_from_row(row: list) -> Item:
+    item = Item(row[0])
+    (item.name, item.description, item.icon, item.rarity, item.wiki_link, item.account_bound, item.stackable,
+     item.deletable, item.rare_for_salvage, item.price) = row[1:11]
+    for count, place, account, slots, partial_count, partial_slots in row[11]:
+        source = Source(count, place, account, slots)
+        source.partial_count = partial_count
+        source.partial_slots = partial_slots
+        item.sources.append(source)
+    return item
+
+
+def save_snapshot(model, file_name: str = SNAPSHOT_FILE) -> None:
+    json_data = {
+        'version': snapshot_version,
+        'created': time.time(),
+        'accounts': model.accounts,
+        'material_storage_size': model.material_storage_size,
+        'empty_slots': model.empty_slots,
+        'ecto_salvage_price': model.ecto_salvage_price,
+        'items': [item_to_row(item) for item in model.items.values()],
+        'recipes': model.recipes,
+        'recipe_results': [item_to_row(item) for item in model.recipe_results.values()],
+    }
+    # written aside and swapped, so a crash never leaves broken snapshot behind
+    temp_file_name = file_name + '.tmp'
+    with gzip.open(temp_file_name, 'wt', encoding='utf-8') as out_file:
+        json.dump(json_data, out_file, separators=(',', ':'), ensure_ascii=False)
+    os.replace(temp_file_name, file_name)
+
+
+def load_snapshot(model, file_name: str = SNAPSHOT_FILE) -> float:
+    try:
+        with gzip.open(file_name, 'rt', encoding='utf-8') as in_file:
+            json_data = json.load(in_file)
+    except (OSError, ValueError) as ex:
+        raise InvalidSnapshot(file_name, str(ex))
+
+    if json_data.get('version', None) != snapshot_version:
+        raise InvalidSnapshot(file_name, f"version {json_data.get('version', None)} is not {snapshot_version}")
+
+    model.accounts = json_data['accounts']
+    model.material_storage_size = json_data['material_storage_size']
+    model.empty_slots = json_data['empty_slots']
+    model.ecto_salvage_price = json_data['ecto_salvage_price']
+    model.items = {row[0]: item_from_row(row) for row in json_data['items']}
+    model.described_item_ids = set(model.items.keys())
+    model.recipes = json_data['recipes']
+    model.recipe_results = {row[0]: item_from_row(row) for row in json_data['recipe_results']}
+    model.counts = CountIndex(model.items, model.accounts)
+    model.recipe_engine = RecipeEngine(model.recipes)
+    model.next_generation()
+    model.publish_advice(advice_categories)
+    model.is_ready = True
+
+    return json_data['created']
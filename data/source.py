@@ -1,16 +1,37 @@
+import sys
+
 source_names = {
     "$bank": "Account Bank",
     "$storage": "Material Storage",
     "$shared_slot": "Shared Inventory Slot"
 }
 
+stack_size = 250
+
 
 class Source:
+    # one source is all slots with same item at same place of same account
+    __slots__ = ('count', 'place', 'account', 'slots', 'partial_count', 'partial_slots', 'account_bound')
 
-    def __init__(self, count: int, place: str, account: str):
+    def __init__(self, count: int, place: str, account: str, slots: int = 1, account_bound: bool = False):
         self.count = count
-        self.place = place
-        self.account = account
+        self.place = sys.intern(place)
+        self.account = sys.intern(account)
+        self.slots = slots
+        # binding of last slot added, as item takes binding of last slot loaded
+        self.account_bound = account_bound
+        self.partial_count = 0
+        self.partial_slots = 0
+        if slots == 1 and 0 < count < stack_size:
+            self.partial_count = count
+            self.partial_slots = 1
+
+    def merge(self, source: 'Source') -> None:
+        self.count = self.count + source.count
+        self.slots = self.slots + source.slots
+        self.partial_count = self.partial_count + source.partial_count
+        self.partial_slots = self.partial_slots + source.partial_slots
+        self.account_bound = source.account_bound
 
     def place_repr(self) -> str:
         return source_names.get(self.place, self.place)
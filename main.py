@@ -1,11 +1,13 @@
 import version
 from data.item import ItemForDisplay
 from data.model import Model
+from data.snapshot import InvalidSnapshot, SNAPSHOT_FILE, load_snapshot, save_snapshot
 from messaging.console_print_listener import ConsolePrintListener
 from messaging.messaging import Messaging
 from reader.gw2api import GW2Api
 
 import argparse
+import json
 
 def nice_print_advice_list(advices: list[ItemForDisplay], name: str) -> None:
 
@@ -18,20 +20,42 @@ def nice_print_advice_list(advices: list[ItemForDisplay], name: str) -> None:
             print(f"\tAdvice: {item.advice}")
         print("\tSources:")
         for source in item.sources:
-            print(f"\t\t{source.count} {source.place}@{source.account}")
+            stacks = f" ({source.slots} stacks)" if source.slots > 1 else ""
+            print(f"\t\t{source.count} {source.place}@{source.account}{stacks}")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="GW2 inventory cleanup tool", epilog=f"Version {version.app_version}")
-    parser.add_argument('api_key', metavar='API_KEY', type=str, help='GW2 Account API key')
+    parser.add_argument('api_key', metavar='API_KEY', type=str, nargs='?', help='GW2 Account API key')
+    parser.add_argument('--snapshot', metavar='FILE', type=str, default=SNAPSHOT_FILE,
+                        help=f'Snapshot of last load, saved after every load (default {SNAPSHOT_FILE})')
+    parser.add_argument('--offline', action='store_true', help='Advise on snapshot of last load, without API')
+    parser.add_argument('--report-json', metavar='FILE', type=str, default=None,
+                        help='Write timing of load stages and API requests to FILE as json')
     args = parser.parse_args()
 
-    api = GW2Api(args.api_key)
+    if not args.offline and not args.api_key:
+        parser.error('API_KEY is required unless --offline is used')
 
     messaging = Messaging()
     messaging.add_listener(ConsolePrintListener())
-    model = Model([api], messaging)
 
-    model.init_from_api()
+    if args.offline:
+        model = Model([], messaging)
+        try:
+            load_snapshot(model, args.snapshot)
+        except InvalidSnapshot as ex:
+            parser.error(f'{ex.file_name}: {ex.reason}')
+    else:
+        api = GW2Api(args.api_key)
+        model = Model([api], messaging)
+        model.init_from_api()
+        save_snapshot(model, args.snapshot)
+        if args.report_json:
+            with open(args.report_json, 'w', encoding='utf-8') as out_file:
+                json.dump(model.load_report.to_dict(), out_file, indent=2)
+
+    # progress is printed from its own thread, it is let to finish before advice is printed
+    messaging.flush()
 
     nice_print_advice_list(model.get_advice_stacks(), "Restack")
     nice_print_advice_list(model.get_gobbler_advice(), "Gobble")
@@ -42,4 +66,4 @@ if __name__ == "__main__":
     nice_print_advice_list(model.get_advice_just_delete(), "Delete")
     nice_print_advice_list(model.get_misc_advice(), "Misc")
     nice_print_advice_list(model.get_karma_consumables_advice(), "Karma")
-    nice_print_advice_list(model.get_just_salvage_advice(), "Salvage")
\ No newline at end of file
+    nice_print_advice_list(model.get_just_salvage_advice(), "Salvage")
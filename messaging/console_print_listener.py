@@ -1,7 +1,12 @@
 from messaging.messaging import Listener
+from messaging.progress import ProgressEvent
 
 
 class ConsolePrintListener(Listener):
+    progress_interval = 0.5
 
     def listen(self, message: str) -> None:
         print(message)
+
+    def progress(self, event: ProgressEvent) -> None:
+        print(event.message)
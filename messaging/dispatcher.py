@@ -0,0 +1,75 @@
+import threading
+import time
+from collections import deque
+
+from log_config import logger
+from messaging.progress import ProgressEvent
+
+# messages kept for listener which can not keep up, oldest are dropped first
+max_pending_messages = 100
+
+
+class ListenerDispatcher:
+    # delivers messages and progress to one listener on its own thread, loading never waits for listener
+
+    def __init__(self, listener, interval: float):
+        self.listener = listener
+        self.interval = interval
+        self.condition = threading.Condition()
+        self.messages: deque[str] = deque(maxlen=max_pending_messages)
+        # only latest progress per stage and account is delivered
+        self.progress: dict[tuple[str, str | None], ProgressEvent] = dict()
+        self.delivered = 0.0
+        self.delivering = False
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name=f'dispatch-{type(self.listener).__name__}',
+                                           daemon=True)
+            self.thread.start()
+
+    def put_message(self, message: str) -> None:
+        with self.condition:
+            self.messages.append(message)
+            self.start()
+            self.condition.notify_all()
+
+    def put_progress(self, event: ProgressEvent) -> None:
+        with self.condition:
+            self.progress[event.key] = event
+            self.start()
+            self.condition.notify_all()
+
+    def pending(self) -> bool:
+        return bool(self.messages or self.progress)
+
+    def run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.pending():
+                    self.condition.wait()
+                # events arriving while waiting are coalesced into this delivery
+                while (delay := self.delivered + self.interval - time.monotonic()) > 0:
+                    self.condition.wait(delay)
+                messages = list(self.messages)
+                self.messages.clear()
+                events = sorted(self.progress.values(), key=lambda event: event.elapsed)
+                self.progress.clear()
+                self.delivering = True
+            try:
+                for message in messages:
+                    self.listener.listen(message)
+                for event in events:
+                    self.listener.progress(event)
+            except Exception as ex:
+                logger.error(f'Listener {type(self.listener).__name__} failed: ({ex})')
+            finally:
+                with self.condition:
+                    self.delivering = False
+                    self.delivered = time.monotonic()
+                    self.condition.notify_all()
+
+    def flush(self, timeout: float) -> bool:
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending() and not self.delivering, timeout)
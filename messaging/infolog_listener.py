@@ -1,10 +1,15 @@
 import logging
 
 from messaging.messaging import Listener
+from messaging.progress import ProgressEvent
 
 from log_config import logger
 
 class InfoLogListener(Listener):
+    progress_interval = 1.0
 
     def listen(self, message: str) -> None:
         logger.info(message)
+
+    def progress(self, event: ProgressEvent) -> None:
+        logger.info(f'{event.message} ({event.elapsed:.1f}s)')
@@ -1,8 +1,20 @@
+from messaging.dispatcher import ListenerDispatcher
+from messaging.progress import ProgressEvent
+
+# how long to wait for listeners to take pending messages
+flush_timeout = 5.0
+
+
 class Listener:
+    # least seconds between deliveries of messages and progress to this listener
+    progress_interval = 0.25
 
     def listen(self, message: str) -> None:
         pass
 
+    def progress(self, event: ProgressEvent) -> None:
+        pass
+
     def abort(self) -> None:
         pass
 
@@ -12,14 +24,21 @@ class Listener:
     def clear_ui(self):
         pass
 
+    def advice_ready(self, category: str) -> None:
+        pass
+
 
 class Messaging:
 
     def __init__(self):
         self.listeners = []
+        self.dispatchers: list[ListenerDispatcher] = []
 
     def add_listener(self, listener: Listener) -> None:
         self.listeners.append(listener)
+        # listeners ignoring messages and progress do not need thread of their own
+        if type(listener).listen is not Listener.listen or type(listener).progress is not Listener.progress:
+            self.dispatchers.append(ListenerDispatcher(listener, listener.progress_interval))
 
     def abort(self) -> None:
         for listener in self.listeners:
@@ -33,6 +52,18 @@ class Messaging:
         for listener in self.listeners:
             listener.clear_ui()
 
-    def broadcast(self, message: str) -> None:
+    def advice_ready(self, category: str) -> None:
         for listener in self.listeners:
-            listener.listen(message)
+            listener.advice_ready(category)
+
+    def broadcast(self, message: str) -> None:
+        for dispatcher in self.dispatchers:
+            dispatcher.put_message(message)
+
+    def progress(self, event: ProgressEvent) -> None:
+        for dispatcher in self.dispatchers:
+            dispatcher.put_progress(event)
+
+    def flush(self, timeout: float = flush_timeout) -> None:
+        for dispatcher in self.dispatchers:
+            dispatcher.flush(timeout)
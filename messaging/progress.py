@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    # stage of load, e.g. 'load' for whole load, 'characters' or 'bank' for part of account
+    stage: str
+    account: str | None
+    done: int
+    total: int
+    # seconds since load started
+    elapsed: float
+    message: str
+
+    @property
+    def key(self) -> tuple[str, str | None]:
+        # newer event with same key replaces older one not yet delivered
+        return self.stage, self.account
+
+    @property
+    def fraction(self) -> float:
+        return self.done / self.total if self.total > 0 else 0.0
@@ -1,11 +1,16 @@
 from messaging.messaging import Listener
-
-from queue import Queue
+from messaging.progress import ProgressEvent
 
 class QueueListener(Listener):
+    progress_interval = 0.1
 
-    def __init__(self, queue: Queue):
+    def __init__(self, queue):
+        # anything with put, page takes items from it
         self.queue = queue
 
     def listen(self, message: str) -> None:
         self.queue.put(message)
+
+    def progress(self, event: ProgressEvent) -> None:
+        # progress is shown in progress bar, not as notification
+        self.queue.put(event)
@@ -0,0 +1,77 @@
+import json
+import sqlite3
+import threading
+
+from log_config import logger
+
+CATALOG_CACHE_FILE = 'gw2_catalog_cache.sqlite'
+
+# bump when shape of stored entries changes, old entries are then dropped
+catalog_schema_version = 2
+
+# ids asked in one query, below limit of sqlite variables (999 in older versions)
+ids_per_query = 900
+
+
+class CatalogCache:
+
+    def __init__(self, file_name: str = CATALOG_CACHE_FILE):
+        self.lock = threading.Lock()
+        self.build_id = None
+        try:
+            self.db = self.open(file_name)
+        except sqlite3.Error as ex:
+            logger.warning(f'Catalog cache {file_name} can not be used, keeping catalog in memory, error: ({ex})')
+            self.db = self.open(':memory:')
+
+    @staticmethod
+    def open(file_name: str) -> sqlite3.Connection:
+        db = sqlite3.connect(file_name, check_same_thread=False)
+        db.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)')
+        db.execute('CREATE TABLE IF NOT EXISTS catalog '
+                   '(kind TEXT, id INTEGER, build INTEGER, data TEXT, PRIMARY KEY (kind, id))')
+        db.commit()
+        return db
+
+    def use_build(self, build_id: int) -> None:
+        with self.lock:
+            if self.build_id == build_id:
+                return
+            stored = dict(self.db.execute('SELECT key, value FROM meta').fetchall())
+            if stored.get('build') != str(build_id) or stored.get('schema') != str(catalog_schema_version):
+                logger.info(f'Catalog cache is stale, game build is now {build_id}')
+                self.db.execute('DELETE FROM catalog')
+                self.db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', ('build', str(build_id)))
+                self.db.execute('INSERT OR REPLACE INTO meta VALUES (?, ?)', ('schema', str(catalog_schema_version)))
+                self.db.commit()
+            self.build_id = build_id
+
+    def get(self, kind: str, ids) -> dict[int, dict]:
+        ids = list(set(ids))
+        rows = []
+        with self.lock:
+            for start in range(0, len(ids), ids_per_query):
+                ids_chunk = ids[start:start + ids_per_query]
+                rows.extend(self.db.execute(
+                    f'SELECT id, data FROM catalog WHERE kind = ? AND build = ? '
+                    f'AND id IN ({",".join("?" * len(ids_chunk))})', (kind, self.build_id, *ids_chunk)))
+        # decoding does not need lock, other stages can use cache meanwhile
+        return {entry_id: json.loads(data) for entry_id, data in rows}
+
+    def put(self, kind: str, entries: list[dict]) -> None:
+        with self.lock:
+            self.db.executemany('INSERT OR REPLACE INTO catalog VALUES (?, ?, ?, ?)',
+                                [(kind, entry['id'], self.build_id, json.dumps(entry)) for entry in entries])
+            self.db.commit()
+
+
+shared_cache: CatalogCache | None = None
+shared_cache_lock = threading.Lock()
+
+
+def shared_catalog_cache() -> CatalogCache:
+    global shared_cache
+    with shared_cache_lock:
+        if shared_cache is None:
+            shared_cache = CatalogCache()
+        return shared_cache
@@ -1,11 +1,17 @@
-from functools import lru_cache
+import random
+import time
+from email.utils import parsedate_to_datetime
 from itertools import batched
+from typing import Callable
 
 import requests
-from retrying import retry
 
 from log_config import logger
 from messaging.messaging import Listener
+from reader.parallel import parallel_map
+from reader.rate_limiter import RateLimiter, rate_limiter
+from reader.request_stats import RequestStats
+from reader.response_cache import ResponseCache, cached
 
 required_permissions = ['account', 'characters', 'inventories']
 
@@ -13,6 +19,31 @@ api_uri_base = 'https://api.guildwars2.com'
 
 items_per_request = 200
 
+# how many chunks of ids are requested in parallel
+fetch_workers = 4
+
+# several load stages use client at once, each with its own workers, kept connections are shared by all of them
+parallel_callers = 4
+
+# characters with inventories fetched per single page, 200 is max allowed by api
+characters_per_page = 200
+
+# single request is retried with exponential backoff and jitter
+retry_attempts = 4
+retry_base_delay = 0.2
+retry_max_delay = 10.0
+retry_status_codes = (408, 429, 500, 502, 503, 504)
+
+# seconds account responses are reused, inventories change while playing
+account_ttl = 3600.0
+inventory_ttl = 60.0
+
+# account responses of single api key kept in memory
+account_cache_entries = 64
+
+# returned for character which disappeared between reading list of characters and reading character itself
+missing_character = dict()
+
 
 # define Python user-defined exceptions
 class InvalidAccessToken(Exception):
@@ -36,8 +67,10 @@ class UserAborted(Exception):
     pass
 
 
-def retry_if_timeout(exception):
-    return isinstance(exception, Timeout)
+class BulkRequestFailed(Exception):
+
+    def __init__(self, status_code: int):
+        self.status_code = status_code
 
 
 def check_abort(f):
@@ -50,23 +83,133 @@ def check_abort(f):
     return wrapper
 
 
-class GW2Api(Listener):
+class ApiClient:
 
-    def __init__(self, api_key: str):
+    def __init__(self, workers: int = fetch_workers, limiter: RateLimiter = None,
+                 transport: requests.adapters.BaseAdapter = None):
         self.aborted = False
 
+        # transport replaces http for api, used to run against recorded or generated data
+        self.transport = transport
+        self.workers = workers
+        # single session for all threads, its pool keeps connections alive between requests and loads
+        self.s = self.new_session()
+        self.limiter = limiter if limiter else rate_limiter
+        self.stats = RequestStats()
+
+    def new_session(self) -> requests.Session:
+        session = requests.Session()
+        if self.transport:
+            session.mount(api_uri_base, self.transport)
+        else:
+            pool_size = max(1, self.workers) * parallel_callers
+            session.mount(api_uri_base, requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        return session
+
+    def close(self) -> None:
+        self.s.close()
+
+    def abort(self) -> None:
+        self.aborted = True
+
+    @staticmethod
+    def retry_after(r: requests.Response) -> float | None:
+        value = r.headers.get('Retry-After', None)
+        if value is None:
+            return None
+        if value.isdigit():
+            return float(value)
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, path: str, params: list = None, headers: dict = None) -> requests.Response:
+        for attempt in range(retry_attempts):
+            if self.aborted:
+                raise UserAborted()
+            self.limiter.acquire()
+            if self.aborted:
+                raise UserAborted()
+            server_delay = None
+            if attempt > 0:
+                self.stats.record_retry(path)
+            try:
+                started = time.perf_counter()
+                r = self.s.get(f'{api_uri_base}{path}', params=params, headers=headers)
+                self.stats.record_request(path, time.perf_counter() - started, len(r.content))
+                if r.status_code not in retry_status_codes:
+                    return r
+                self.stats.record_error(path)
+                logger.warning(f"Api call {path} failed with {r.status_code}, attempt {attempt + 1}.")
+                server_delay = self.retry_after(r)
+                if r.status_code == 429:
+                    self.limiter.penalize(server_delay if server_delay is not None else retry_base_delay)
+            except (requests.ConnectionError, requests.Timeout) as ex:
+                self.stats.record_error(path)
+                logger.warning(f"Api call {path} failed with {ex}, attempt {attempt + 1}.")
+            if attempt + 1 < retry_attempts:
+                delay = random.uniform(0, min(retry_max_delay, retry_base_delay * 2 ** attempt))
+                if server_delay is not None:
+                    delay = max(delay, server_delay)
+                time.sleep(delay)
+        logger.warning(f"Giving up on api call {path}.")
+        raise Timeout()
+
+    def cached_by_id(self, kind: str, ids, ttl: float, fetch: Callable[[list], list]) -> list:
+        fetched_counts = []
+
+        def counted_fetch(missing_ids: list) -> list:
+            fetched_counts.append(len(missing_ids))
+            return fetch(missing_ids)
+
+        entries = self.responses.cached_by_id(kind, ids, ttl, counted_fetch)
+        self.stats.record_cache(kind, len(ids) - sum(fetched_counts), sum(fetched_counts))
+        return entries
+
+    def fetch_chunk(self, path: str, params: list, ids_chunk: tuple, on_chunk: Callable = None,
+                    project: Callable = None) -> list:
+        r = self.get(path, params + [('ids', ",".join(map(str, ids_chunk)))])
+        if r.status_code == 404:
+            # none of ids in chunk is known to api
+            return []
+        fetched = r.json()
+        if project:
+            fetched = [project(entry) for entry in fetched]
+        if on_chunk:
+            on_chunk(fetched)
+        return fetched
+
+    def fetch_chunks(self, path: str, ids, params: list, on_chunk: Callable = None, project: Callable = None) -> list:
+        ids_chunks = list(batched(ids, items_per_request))
+        if self.workers <= 1 or len(ids_chunks) <= 1:
+            chunks = [self.fetch_chunk(path, params, ids_chunk, on_chunk, project) for ids_chunk in ids_chunks]
+        else:
+            chunks = parallel_map(lambda ids_chunk: self.fetch_chunk(path, params, ids_chunk, on_chunk, project),
+                                  ids_chunks, self.workers)
+        return [entry for chunk in chunks for entry in chunk]
+
+
+class GW2Api(ApiClient, Listener):
+
+    def __init__(self, api_key: str, workers: int = fetch_workers, limiter: RateLimiter = None,
+                 transport: requests.adapters.BaseAdapter = None):
+        super().__init__(workers, limiter, transport)
+
         self.api_key = api_key
-        self.s = requests.Session()
+        self.responses = ResponseCache(account_cache_entries)
+        # etag of last response for every account request, to ask api only for changes
+        self.etags: dict[str, str] = dict()
         self.validate()
 
     def validate(self) -> None:
-        r = self.s.get(f'{api_uri_base}/v2/tokeninfo', params=self.get_auth_params())
-
-        data = r.json()
+        r = self.get('/v2/tokeninfo', self.get_auth_params())
 
         if not r.status_code == 200:
             raise InvalidAccessToken(self.api_key)
 
+        data = r.json()
+
         if 'permissions' in data:
             for permission in required_permissions:
                 if permission not in data['permissions']:
@@ -74,115 +217,111 @@ class GW2Api(Listener):
         else:
             raise InvalidAccessToken(self.api_key)
 
-    def abort(self) -> None:
-        self.aborted = True
-
-    @staticmethod
-    def verify_response(r) -> None:
-        if r.status_code in (502, 504, 408):
-            logger.warning("Timeout calling api.")
-            raise Timeout()
-
     def get_auth_params(self) -> list:
         return [("access_token", self.api_key)]
 
+    def get_tracked(self, path: str, params: list, if_changed: bool = False) -> requests.Response | None:
+        key = path + '?' + '&'.join(f'{name}={value}' for name, value in params if name != 'access_token')
+        headers = {'If-None-Match': self.etags[key]} if if_changed and key in self.etags else None
+        r = self.get(path, params, headers)
+        if r.status_code == 304:
+            return None
+        if 'ETag' in r.headers:
+            self.etags[key] = r.headers['ETag']
+        return r
+
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
+    @cached('account_name', account_ttl)
     def account_name(self) -> str:
-        r = self.s.get(f'{api_uri_base}/v2/account', params=self.get_auth_params())
-        self.verify_response(r)
+        r = self.get('/v2/account', self.get_auth_params())
         return r.json().get("name", "?")
 
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
+    @cached('material_storage', inventory_ttl)
     def material_storage(self):
-        r = self.s.get(f'{api_uri_base}/v2/account/materials', params=self.get_auth_params())
-        self.verify_response(r)
-        return r.json()
+        return self.get_tracked('/v2/account/materials', self.get_auth_params()).json()
 
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
+    @cached('bank', inventory_ttl)
     def bank(self):
-        r = self.s.get(f'{api_uri_base}/v2/account/bank', params=self.get_auth_params())
-        self.verify_response(r)
-        return r.json()
+        return self.get_tracked('/v2/account/bank', self.get_auth_params()).json()
 
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
+    @cached('shared_slots', inventory_ttl)
     def shared_slots(self):
-        r = self.s.get(f'{api_uri_base}/v2/account/inventory', params=self.get_auth_params())
-        self.verify_response(r)
-        return r.json()
+        return self.get_tracked('/v2/account/inventory', self.get_auth_params()).json()
 
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
+    @cached('characters', inventory_ttl)
     def characters(self):
-        r = self.s.get(f'{api_uri_base}/v2/characters', params=self.get_auth_params())
-        self.verify_response(r)
+        r = self.get('/v2/characters', self.get_auth_params())
         return r.json()
 
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
-    def character_inventory(self, character_name: str):
-        r = self.s.get(f'{api_uri_base}/v2/characters/{requests.utils.quote(character_name)}/inventory',
-                       params=self.get_auth_params())
-        self.verify_response(r)
-        return r.json()
-
-    @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
-    def item_info(self, item_ids: frozenset):
-        item_infos = []
-        for item_ids_chunk in batched(item_ids, items_per_request):
-            if self.aborted:
+    @cached('characters_inventories', inventory_ttl)
+    def characters_inventories(self) -> dict:
+        try:
+            return self.characters_inventories_paged()
+        except (BulkRequestFailed, Timeout, ValueError, KeyError, TypeError) as ex:
+            logger.warning(f"Bulk loading of characters failed ({ex!r}), loading characters one by one.")
+            return self.characters_inventories_one_by_one({})
+
+    def characters_inventories_paged(self, if_changed: bool = False) -> dict | None:
+        inventories = dict()
+        page = 0
+        page_total = 1
+        while page < page_total:
+            # account can not have more than one page of characters, so first page tells if anything changed
+            r = self.get_tracked('/v2/characters',
+                                 self.get_auth_params() + [('page', page), ('page_size', characters_per_page)],
+                                 if_changed and page == 0)
+            if r is None:
                 return None
-            r = self.s.get(f'{api_uri_base}/v2/items', params=[('ids', ",".join(map(str, item_ids_chunk)))])
-            self.verify_response(r)
-            item_infos.extend(r.json())
-        return item_infos
+            if r.status_code != 200:
+                raise BulkRequestFailed(r.status_code)
+            page_total = int(r.headers.get('X-Page-Total', 1))
+            for character in r.json():
+                inventories[character['name']] = self.character_state(character, character['bags'])
+            page = page + 1
+        return inventories
 
-    @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
-    def item_prices(self, item_ids: frozenset):
-        item_prices = []
-        for item_ids_chunk in batched(item_ids, items_per_request):
-            if self.aborted:
-                return None
-            r = self.s.get(f'{api_uri_base}/v2/commerce/prices',
-                           params=[('ids', ",".join(map(str, item_ids_chunk)))])
-            self.verify_response(r)
-            item_prices.extend(r.json())
-        return item_prices
+    @staticmethod
+    def character_state(character: dict, bags: list) -> dict:
+        return {'bags': bags, 'age': character.get('age', None), 'last_modified': character.get('last_modified', None)}
+
+    def characters_inventories_one_by_one(self, known_states: dict) -> dict:
+        # characters deleted or renamed after list was read are left out, as if they were not in list
+        character_names = self.get('/v2/characters', self.get_auth_params()).json()
+        states = parallel_map(lambda name: self.character_if_changed(name, known_states.get(name, None)),
+                              character_names, self.workers)
+        return {name: state for name, state in zip(character_names, states) if state is not missing_character}
+
+    def character_if_changed(self, character_name: str, known_state: dict | None) -> dict | None:
+        path = f'/v2/characters/{requests.utils.quote(character_name)}'
+        r = self.get(f'{path}/core', self.get_auth_params())
+        if r.status_code != 200:
+            logger.warning(f"Character {character_name} could not be read ({r.status_code}), skipping it.")
+            return missing_character
+        core = r.json()
+        if known_state and known_state['age'] == core.get('age', None) \
+                and known_state['last_modified'] == core.get('last_modified', None):
+            return None
+        r = self.get(f'{path}/inventory', self.get_auth_params())
+        if r.status_code != 200:
+            logger.warning(f"Inventory of character {character_name} could not be read ({r.status_code}), skipping it.")
+            return missing_character
+        return self.character_state(core, r.json()['bags'])
 
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
-    def item_price(self, item_id: int):
-        r = self.s.get(f'{api_uri_base}/v2/commerce/prices/{str(item_id)}')
-        self.verify_response(r)
-        return r.json()
+    def characters_inventories_if_changed(self, known_states: dict) -> dict | None:
+        # None means nothing changed, otherwise all current characters, None for unchanged ones
+        try:
+            return self.characters_inventories_paged(if_changed=True)
+        except (BulkRequestFailed, Timeout, ValueError, KeyError, TypeError) as ex:
+            logger.warning(f"Bulk refresh of characters failed ({ex!r}), checking characters one by one.")
+        return self.characters_inventories_one_by_one(known_states)
 
     @check_abort
-    @lru_cache(maxsize=None)
-    @retry(wait_fixed=200, stop_max_attempt_number=3, retry_on_exception=retry_if_timeout, wrap_exception=True)
-    def recipes(self):
-        r = self.s.get(f'{api_uri_base}/v2/recipes')
-        self.verify_response(r)
-        recipe_ids = r.json()
-        recipes = []
-        for recipe_ids_chunk in batched(recipe_ids, items_per_request):
-            if self.aborted:
-                return None
-            r = self.s.get(f'{api_uri_base}/v2/recipes',
-                           params=[('v', '2022-03-09T02:00:00.000Z'), ('ids', ",".join(map(str, recipe_ids_chunk)))])
-            self.verify_response(r)
-            recipes.extend(r.json())
-        return recipes
+    def account_data_if_changed(self, path: str) -> list | None:
+        r = self.get_tracked(path, self.get_auth_params(), if_changed=True)
+        return r.json() if r is not None else None
@@ -0,0 +1,121 @@
+import threading
+from typing import Callable
+
+import requests
+
+from log_config import logger
+from reader.catalog_cache import CatalogCache, shared_catalog_cache
+from reader.gw2api import ApiClient, check_abort, fetch_workers
+from reader.parallel import parallel_map
+from reader.projection import project_item, project_recipe
+from reader.rate_limiter import RateLimiter
+from reader.response_cache import ResponseCache, cached, shared_response_cache
+
+# version of recipe schema returned by api
+recipes_schema = '2022-03-09T02:00:00.000Z'
+
+# seconds public responses are reused, catalog changes only with game build, prices change all the time
+price_ttl = 300.0
+build_ttl = 600.0
+catalog_ttl = 86400.0
+
+
+class GW2Catalog(ApiClient):
+    # public part of api, items, recipes and prices are same for every account
+
+    def __init__(self, catalog_cache: CatalogCache = None, workers: int = fetch_workers,
+                 limiter: RateLimiter = None, responses: ResponseCache = None,
+                 transport: requests.adapters.BaseAdapter = None):
+        super().__init__(workers, limiter, transport)
+
+        self.catalog_cache = catalog_cache if catalog_cache else shared_catalog_cache()
+        self.responses = responses if responses else shared_response_cache()
+
+    @check_abort
+    @cached('build', build_ttl)
+    def build(self) -> int:
+        r = self.get('/v2/build')
+        return r.json()['id']
+
+    def cached_catalog(self, kind: str, path: str, ids, params: list, project: Callable):
+        self.catalog_cache.use_build(self.build())
+        entries = self.catalog_cache.get(kind, ids)
+        missing_ids = [entry_id for entry_id in ids if entry_id not in entries]
+        self.stats.record_cache(f'{kind}_store', len(entries), len(missing_ids))
+        for entry in self.fetch_chunks(path, missing_ids, params, lambda chunk: self.catalog_cache.put(kind, chunk),
+                                       project):
+            entries[entry['id']] = entry
+        return [entries[entry_id] for entry_id in ids if entry_id in entries]
+
+    @check_abort
+    def item_info(self, item_ids: frozenset):
+        return self.cached_by_id(
+            'items', item_ids, catalog_ttl,
+            lambda missing_ids: self.cached_catalog('items', '/v2/items', missing_ids, [], project_item))
+
+    @check_abort
+    def item_prices(self, item_ids: frozenset):
+        return self.cached_by_id(
+            'prices', item_ids, price_ttl,
+            lambda missing_ids: self.fetch_chunks('/v2/commerce/prices', missing_ids, []))
+
+    @check_abort
+    @cached('price', price_ttl)
+    def item_price(self, item_id: int):
+        r = self.get(f'/v2/commerce/prices/{str(item_id)}')
+        return r.json()
+
+    @check_abort
+    @cached('recipe_ids', catalog_ttl)
+    def recipe_ids(self) -> list:
+        r = self.get('/v2/recipes')
+        return r.json()
+
+    @check_abort
+    def recipes(self):
+        return self.catalog_recipes(self.recipe_ids())
+
+    def catalog_recipes(self, recipe_ids) -> list:
+        return self.cached_by_id(
+            'recipes', recipe_ids, catalog_ttl,
+            lambda missing_ids: self.cached_catalog('recipes', '/v2/recipes', missing_ids, [('v', recipes_schema)],
+                                                    project_recipe))
+
+    def recipe_search(self, item_id: int) -> dict | None:
+        r = self.get('/v2/recipes/search', [('input', item_id)])
+        if r.status_code != 200:
+            # failed search is not cached, it is asked again on next load
+            logger.warning(f"Recipe search for item {item_id} failed with {r.status_code}.")
+            return None
+        return {'id': item_id, 'recipe_ids': r.json()}
+
+    def recipe_searches(self, item_ids: list) -> list:
+        self.catalog_cache.use_build(self.build())
+        searches = self.catalog_cache.get('recipe_search', item_ids)
+        missing_ids = [item_id for item_id in item_ids if item_id not in searches]
+        self.stats.record_cache('recipe_search_store', len(searches), len(missing_ids))
+        if missing_ids:
+            found = [search for search in parallel_map(self.recipe_search, missing_ids, self.workers)
+                     if search is not None]
+            self.catalog_cache.put('recipe_search', found)
+            for search in found:
+                searches[search['id']] = search
+        return list(searches.values())
+
+    @check_abort
+    def recipes_using(self, item_ids: frozenset):
+        searches = self.cached_by_id('recipe_search', item_ids, catalog_ttl, self.recipe_searches)
+        recipe_ids = sorted({recipe_id for search in searches for recipe_id in search['recipe_ids']})
+        return self.catalog_recipes(recipe_ids)
+
+
+shared_catalog_client: GW2Catalog | None = None
+shared_catalog_lock = threading.Lock()
+
+
+def shared_catalog() -> GW2Catalog:
+    global shared_catalog_client
+    with shared_catalog_lock:
+        if shared_catalog_client is None:
+            shared_catalog_client = GW2Catalog()
+        return shared_catalog_client
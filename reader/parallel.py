@@ -0,0 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator
+
+
+@contextmanager
+def cancelling_executor(workers: int) -> Iterator[ThreadPoolExecutor]:
+    # on first failure or abort tasks not started yet are dropped, instead of waiting for all of them to run
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        try:
+            yield executor
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+
+
+def parallel_map(fn: Callable, items: Iterable, workers: int) -> list:
+    with cancelling_executor(workers) as executor:
+        return list(executor.map(fn, items))
@@ -0,0 +1,26 @@
+import sys
+
+# only these fields of catalog entries are used by model, rest is dropped right after decoding
+item_fields = ('id', 'name', 'icon', 'rarity', 'type', 'flags', 'level', 'description')
+item_details_fields = ('type', 'description')
+recipe_fields = ('id', 'type', 'output_item_id')
+ingredient_fields = ('type', 'id', 'count')
+
+
+def project_item(entry: dict) -> dict:
+    item = {field: entry[field] for field in item_fields if field in entry}
+    item['rarity'] = sys.intern(item['rarity'])
+    item['type'] = sys.intern(item['type'])
+    item['flags'] = [sys.intern(flag) for flag in item.get('flags', [])]
+    details = entry.get('details', None)
+    if details:
+        item['details'] = {field: details[field] for field in item_details_fields if field in details}
+    return item
+
+
+def project_recipe(entry: dict) -> dict:
+    recipe = {field: entry[field] for field in recipe_fields}
+    recipe['type'] = sys.intern(recipe['type'])
+    recipe['ingredients'] = [{field: ingredient[field] for field in ingredient_fields}
+                             for ingredient in entry['ingredients']]
+    return recipe
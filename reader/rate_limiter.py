@@ -0,0 +1,61 @@
+import threading
+import time
+
+# official api allows burst of 300 requests per ip, refilled at 5 requests per second
+default_requests_per_second = 5.0
+default_burst = 300
+
+
+class RateLimiter:
+
+    def __init__(self, requests_per_second: float = default_requests_per_second, burst: int = default_burst):
+        self.lock = threading.Lock()
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.configure(requests_per_second, burst)
+
+    def configure(self, requests_per_second: float, burst: int) -> None:
+        with self.lock:
+            self.requests_per_second = requests_per_second
+            self.burst = burst
+            self.tokens = float(burst)
+            self.updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(float(self.burst), self.tokens + (now - self.updated) * self.requests_per_second)
+        self.updated = now
+
+    def acquire(self) -> float:
+        # token is reserved right away, so waiting callers are served in order and evenly spaced
+        with self.lock:
+            self.refill()
+            self.tokens = self.tokens - 1
+            delay = max(0.0, -self.tokens / self.requests_per_second)
+            if delay > 0:
+                self.waiting = self.waiting + 1
+        if delay > 0:
+            time.sleep(delay)
+            with self.lock:
+                self.waiting = self.waiting - 1
+                self.total_wait = self.total_wait + delay
+        return delay
+
+    def penalize(self, seconds: float) -> None:
+        # server said we are over limit, nobody gets token for given time
+        with self.lock:
+            self.refill()
+            self.tokens = min(self.tokens, -seconds * self.requests_per_second)
+
+    @property
+    def queue_depth(self) -> int:
+        return self.waiting
+
+    @property
+    def wait_time(self) -> float:
+        with self.lock:
+            self.refill()
+            return max(0.0, (1 - self.tokens) / self.requests_per_second)
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,132 @@
+import math
+import threading
+
+# latency percentiles reported for every endpoint
+reported_percentiles = (50, 90, 99)
+
+
+def endpoint_name(path: str) -> str:
+    # character names and single ids are folded, so stats group by endpoint
+    parts = path.split('/')
+    if len(parts) > 3 and parts[2] == 'characters':
+        parts[3] = ':id'
+    if len(parts) > 4 and parts[3] == 'prices':
+        parts[4] = ':id'
+    return '/'.join(parts)
+
+
+def percentile(values: list[float], percent: int) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class EndpointStats:
+
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.retries = 0
+        self.errors = 0
+        self.latencies: list[float] = []
+
+    def add(self, other: 'EndpointStats') -> None:
+        self.requests = self.requests + other.requests
+        self.bytes = self.bytes + other.bytes
+        self.retries = self.retries + other.retries
+        self.errors = self.errors + other.errors
+        self.latencies.extend(other.latencies)
+
+    def report(self) -> dict:
+        report = {'requests': self.requests, 'bytes': self.bytes, 'retries': self.retries, 'errors': self.errors}
+        if self.latencies:
+            report['latency_ms'] = {f'p{percent}': round(percentile(self.latencies, percent) * 1000, 1)
+                                    for percent in reported_percentiles}
+            report['latency_ms']['max'] = round(max(self.latencies) * 1000, 1)
+        return report
+
+
+class RequestStats:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints: dict[str, EndpointStats] = dict()
+        # cache kind -> [hits, misses]
+        self.cache: dict[str, list[int]] = dict()
+
+    def endpoint(self, path: str) -> EndpointStats:
+        name = endpoint_name(path)
+        if name not in self.endpoints:
+            self.endpoints[name] = EndpointStats()
+        return self.endpoints[name]
+
+    def record_request(self, path: str, seconds: float, size: int) -> None:
+        with self.lock:
+            endpoint = self.endpoint(path)
+            endpoint.requests = endpoint.requests + 1
+            endpoint.bytes = endpoint.bytes + size
+            endpoint.latencies.append(seconds)
+
+    def record_retry(self, path: str) -> None:
+        with self.lock:
+            endpoint = self.endpoint(path)
+            endpoint.retries = endpoint.retries + 1
+
+    def record_error(self, path: str) -> None:
+        with self.lock:
+            endpoint = self.endpoint(path)
+            endpoint.errors = endpoint.errors + 1
+
+    def record_cache(self, kind: str, hits: int, misses: int) -> None:
+        with self.lock:
+            counts = self.cache.setdefault(kind, [0, 0])
+            counts[0] = counts[0] + hits
+            counts[1] = counts[1] + misses
+
+    def checkpoint(self) -> 'RequestStats':
+        # copy of stats so far, since() then gives only what happened after
+        copy = RequestStats()
+        copy.add(self)
+        return copy
+
+    def since(self, checkpoint: 'RequestStats') -> 'RequestStats':
+        newer = RequestStats()
+        with self.lock:
+            for name, endpoint in self.endpoints.items():
+                before = checkpoint.endpoints.get(name, EndpointStats())
+                difference = EndpointStats()
+                difference.requests = endpoint.requests - before.requests
+                difference.bytes = endpoint.bytes - before.bytes
+                difference.retries = endpoint.retries - before.retries
+                difference.errors = endpoint.errors - before.errors
+                difference.latencies = endpoint.latencies[len(before.latencies):]
+                if difference.requests or difference.retries or difference.errors:
+                    newer.endpoints[name] = difference
+            for kind, (hits, misses) in self.cache.items():
+                before_hits, before_misses = checkpoint.cache.get(kind, [0, 0])
+                if hits - before_hits or misses - before_misses:
+                    newer.cache[kind] = [hits - before_hits, misses - before_misses]
+        return newer
+
+    def add(self, other: 'RequestStats') -> None:
+        endpoints: dict[str, EndpointStats] = dict()
+        with other.lock:
+            for name, endpoint in other.endpoints.items():
+                endpoints[name] = EndpointStats()
+                endpoints[name].add(endpoint)
+            cache = {kind: list(counts) for kind, counts in other.cache.items()}
+        with self.lock:
+            for name, endpoint in endpoints.items():
+                self.endpoints.setdefault(name, EndpointStats()).add(endpoint)
+            for kind, (hits, misses) in cache.items():
+                counts = self.cache.setdefault(kind, [0, 0])
+                counts[0] = counts[0] + hits
+                counts[1] = counts[1] + misses
+
+    def report(self) -> dict:
+        with self.lock:
+            return {
+                'endpoints': {name: endpoint.report() for name, endpoint in sorted(self.endpoints.items())},
+                'cache': {kind: {'hits': hits, 'misses': misses}
+                          for kind, (hits, misses) in sorted(self.cache.items())},
+            }
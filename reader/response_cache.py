@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable
+
+# least recently used entries are dropped above this size
+default_max_entries = 100_000
+
+missing = object()
+
+
+class ResponseCache:
+
+    def __init__(self, max_entries: int = default_max_entries):
+        self.lock = threading.Lock()
+        self.max_entries = max_entries
+        # key -> (expires at, value), oldest used first
+        self.entries: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple, default=missing):
+        with self.lock:
+            return self.lookup(key, default, time.monotonic())
+
+    def lookup(self, key: tuple, default, now: float):
+        entry = self.entries.get(key, None)
+        if entry is None or entry[0] < now:
+            if entry is not None:
+                del self.entries[key]
+            self.misses = self.misses + 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits = self.hits + 1
+        return entry[1]
+
+    def put(self, key: tuple, value, ttl: float) -> None:
+        with self.lock:
+            self.store(key, value, time.monotonic() + ttl)
+            self.evict()
+
+    def store(self, key: tuple, value, expires: float) -> None:
+        self.entries[key] = (expires, value)
+        self.entries.move_to_end(key)
+
+    def get_many(self, kind: str, ids) -> dict:
+        found = dict()
+        with self.lock:
+            now = time.monotonic()
+            for entry_id in ids:
+                value = self.lookup((kind, entry_id), missing, now)
+                if value is not missing:
+                    found[entry_id] = value
+        return found
+
+    def put_many(self, kind: str, values: dict, ttl: float) -> None:
+        with self.lock:
+            expires = time.monotonic() + ttl
+            for entry_id, value in values.items():
+                self.store((kind, entry_id), value, expires)
+            self.evict()
+
+    def evict(self) -> None:
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.evictions = self.evictions + 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self) -> dict:
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self.entries)}
+
+    def cached_by_id(self, kind: str, ids, ttl: float, fetch: Callable[[list], list]) -> list:
+        # only ids not cached yet are fetched, entries are cached one by one
+        found = self.get_many(kind, ids)
+        missing_ids = [entry_id for entry_id in ids if entry_id not in found]
+        if missing_ids:
+            fetched = {entry['id']: entry for entry in fetch(missing_ids)}
+            self.put_many(kind, fetched, ttl)
+            found.update(fetched)
+        return [found[entry_id] for entry_id in ids if entry_id in found]
+
+
+shared_cache: ResponseCache | None = None
+shared_cache_lock = threading.Lock()
+
+
+def shared_response_cache() -> ResponseCache:
+    global shared_cache
+    with shared_cache_lock:
+        if shared_cache is None:
+            shared_cache = ResponseCache()
+        return shared_cache
+
+
+def cached(kind: str, ttl: float):
+    # responses go to cache of client, account ones are per api key, public ones are shared
+    def decorator(f):
+        @wraps(f)
+        def wrapper(self, *args):
+            key = (kind,) + args
+            value = self.responses.get(key)
+            self.stats.record_cache(kind, int(value is not missing), int(value is missing))
+            if value is missing:
+                value = f(self, *args)
+                self.responses.put(key, value, ttl)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -2,9 +2,7 @@ from nicegui import ui
 
 from data.item import ItemForDisplay
 from messaging.messaging import Listener
-from ui.item_icon_ui import item_icon_ui
-from ui.item_name_label import item_name_label_ui
-from ui.sources_table_ui import sources_table_ui
+from ui.advice_table_ui import AdviceTableUi
 from ui.ui_model import UiModel
 
 
@@ -14,6 +12,7 @@ class Advice(Listener):
         self.ui_model = ui_model
         ui_model.model_messaging.add_listener(self)
 
+        self.category: str | None = None
         self.icon: str | None = None
         self.name: str | None = None
         self.description: str | None = None
@@ -34,9 +33,14 @@ class Advice(Listener):
     def clear_ui(self) -> None:
         self.advice_ui.refresh()
 
+    def advice_ready(self, category: str) -> None:
+        # called from loading thread, panel is refreshed when page is woken up
+        if category == self.category:
+            self.ui_model.ready_advice.put(self)
+
     @ui.refreshable
     def advice_ui(self) -> None:
-        if not self.ui_model.model:
+        if not self.ui_model.model or not self.ui_model.model.is_advice_ready(self.category):
             with ui.expansion(self.name, icon=self.icon).classes('w-full'):
                 if self.description:
                     ui.label(self.description)
@@ -45,20 +49,11 @@ class Advice(Listener):
 
         advices: list[ItemForDisplay] = self.get_data()
 
-        with (((
-        ((ui.expansion(f'{self.name} ({len(advices)})', icon=self.icon, value=len(advices) > 0).classes('w-full')))))):
+        with ui.expansion(f'{self.name} ({len(advices)})', icon=self.icon, value=len(advices) > 0).classes('w-full'):
             if self.description:
                 ui.label(self.description)
-            with ui.grid(columns='auto 2fr auto').classes('w-full'):
-                for item in advices:
-                    item_icon_ui(item)
-                    with ui.column():
-                        item_name_label_ui(item.item)
-                        if item.advice:
-                            ui.label(item.advice)
-                    sources_table_ui(item.sources, item.item.account_bound)
-                    ui.separator().classes('col-span-full')
-
-            if len(advices) == 0:
+            if len(advices) > 0:
+                AdviceTableUi(advices)
+            else:
                 ui.label('No advice here, all is well.')
                 ui.separator().classes('col-span-full')
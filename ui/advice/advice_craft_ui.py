@@ -12,6 +12,7 @@ class AdviceCraftUi(Advice):
         return self.ui_model.model.get_craft_advice()
 
     def config(self):
+        self.category = 'craft'
         self.icon = 'merge_type'
         self.name = 'Craft ingredients away'
         self.description = 'Craft items to get rid of stacks of ingredients. Caveat: which this can save space, it might not be economical or useful.'
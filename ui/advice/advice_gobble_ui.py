@@ -12,6 +12,7 @@ class AdviceGobbleUi(Advice):
         return self.ui_model.model.get_gobbler_advice()
 
     def config(self):
+        self.category = 'gobbler'
         self.icon = 'restaurant'
         self.name = 'Gobble'
         self.description = 'These items can be consumed by gobblers to gain loot. While they have other uses (notably when crafting ascended items), they are plentiful.'
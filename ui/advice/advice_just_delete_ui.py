@@ -12,6 +12,7 @@ class AdviceJustDeleteUi(Advice):
         return self.ui_model.model.get_advice_just_delete()
 
     def config(self):
+        self.category = 'just_delete'
         self.icon = 'delete_sweep'
         self.name = 'Just delete these items'
         self.description = 'Just takes up space and has no uses, typically items from older style collections.'
@@ -12,6 +12,7 @@ class AdviceJustSalvageUi(Advice):
         return self.ui_model.model.get_just_salvage_advice()
 
     def config(self):
+        self.category = 'just_salvage'
         self.icon = 'home_repair_service'
         self.name = 'Salvage items'
         self.description = 'Items that have no other use than to be salvaged with salvage kits.'
@@ -12,6 +12,7 @@ class AdviceKarmaConsumablesUi(Advice):
         return self.ui_model.model.get_karma_consumables_advice()
 
     def config(self):
+        self.category = 'karma_consumables'
         self.icon = 'change_history'
         self.name = 'Karma consumables'
         self.description = 'Items that have no other use than being consumed for karma.'
@@ -12,6 +12,7 @@ class AdviceLS3LS4IBSUi(Advice):
         return self.ui_model.model.get_ls3ls4ibs_advice()
 
     def config(self):
+        self.category = 'ls3ls4ibs'
         self.icon = 'auto_awesome'
         self.name = 'Cleanup living story currencies'
         self.description = 'These items can be consumed to get currency stored in account valet. Beware, they are also currency for getting ascended trinkets, so consider using them to equip characters. They are also used to craft LS4 and LS4 legendary trinkets.'
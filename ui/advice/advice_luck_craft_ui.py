@@ -12,6 +12,7 @@ class AdviceLuckCraftUi(Advice):
         return self.ui_model.model.get_craft_luck_advice()
 
     def config(self):
+        self.category = 'craft_luck'
         self.icon = 'casino'
         self.name = 'Craft luck away'
         self.description = 'Upgrade luck to higher tiers which take up less space or is more easily consumed.'
@@ -12,5 +12,6 @@ class AdviceMiscUi(Advice):
         return self.ui_model.model.get_misc_advice()
 
     def config(self):
+        self.category = 'misc'
         self.icon = 'grain'
         self.name = 'Misc advice'
@@ -12,6 +12,7 @@ class AdvicePlayToConsumeUi(Advice):
         return self.ui_model.model.get_play_to_consume_advice()
 
     def config(self):
+        self.category = 'play_to_consume'
         self.icon = 'hiking'
         self.name = 'Use up by playing the game'
         self.description = 'Items used up by playing the game, requires doing specific content and has no other use outside that.'
\ No newline at end of file
@@ -12,6 +12,7 @@ class AdviceRareSalvageUi(Advice):
         return self.ui_model.model.get_rare_salvage_advice()
 
     def config(self):
+        self.category = 'rare_salvage'
         self.icon = 'recycling'
         self.name = 'Rare salvage'
         self.description = 'Is it worth it to salvage rare item for Ecto or is is more worth it to sell it on Trading post?'
\ No newline at end of file
@@ -12,5 +12,6 @@ class AdviceStacksUi(Advice):
         return self.ui_model.model.get_advice_stacks()
 
     def config(self):
+        self.category = 'stacks'
         self.icon = 'widgets'
         self.name = 'Merge Stacks of items'
\ No newline at end of file
@@ -12,6 +12,7 @@ class AdviceVendorUi(Advice):
         return self.ui_model.model.get_vendor_advice()
 
     def config(self):
+        self.category = 'vendor'
         self.icon = 'storefront'
         self.name = 'Sell to vendors'
         self.description = 'Items that have no other use than being sold to vendors for gold.'
\ No newline at end of file
@@ -0,0 +1,144 @@
+from nicegui import ui
+from nicegui.events import GenericEventArguments
+
+from data.item import ItemForDisplay
+from ui.item_icon_ui import item_description_html
+from ui.item_name_label import item_rarity_colors
+from ui.unique_label import color_hash
+
+rows_per_page = 25
+
+advice_columns = [
+    {'name': 'icon', 'label': '', 'field': 'icon'},
+    {'name': 'name', 'label': 'Item', 'field': 'name', 'sortable': True, 'align': 'left'},
+    {'name': 'count', 'label': 'Count', 'field': 'count', 'sortable': True},
+    {'name': 'sources', 'label': 'Where', 'field': 'where', 'sortable': True, 'align': 'left'},
+]
+
+# page is sorted on server, column name -> key of row
+sort_keys = {
+    'name': lambda row: (row['name'] or '').lower(),
+    'count': lambda row: row['count'],
+    'sources': lambda row: row['where'],
+}
+
+# one row of table, same look as advice had when every item was made of its own elements
+advice_row_slot = r'''
+<q-tr :props="props">
+    <q-td key="icon" :props="props" auto-width>
+        <q-img :src="props.row.icon" class="w-16 h-16 shadow-lg">
+            <q-tooltip v-if="props.row.description" class="bg-transparent">
+                <div class="shadow-lg rounded bg-slate-800/75 p-1 max-w-md text-base" v-html="props.row.description">
+                </div>
+            </q-tooltip>
+        </q-img>
+    </q-td>
+    <q-td key="name" :props="props" class="whitespace-normal">
+        <a :href="props.row.wiki_link" target="_blank" :style="{color: props.row.color, fontWeight: 'bold'}">
+            {{ props.row.name }}
+        </a>
+        <div v-if="props.row.advice">{{ props.row.advice }}</div>
+    </q-td>
+    <q-td key="count" :props="props">{{ props.row.count_text }}</q-td>
+    <q-td key="sources" :props="props">
+        <div v-if="props.row.account_bound" class="text-sm">Account bound</div>
+        <div v-for="source in props.row.sources" class="flex gap-2 items-center">
+            <span>{{ source.count_text }}</span>
+            <span class="h-min rounded p-1" :style="{backgroundColor: source.place_color}">{{ source.place }}</span>
+            <span class="h-min rounded p-1" :style="{backgroundColor: source.account_color}">
+                {{ source.account }}
+            </span>
+        </div>
+    </q-td>
+</q-tr>
+'''
+
+
+def count_text(count: int, slots: int) -> str:
+    return f'{count:n} in {slots} stacks' if slots > 1 else f'{count:n}'
+
+
+def advice_row(index: int, item: ItemForDisplay) -> dict:
+    sources = [{'count': source.count, 'count_text': count_text(source.count, source.slots),
+                'place': source.place_repr(), 'place_color': color_hash(source.place_repr()),
+                'account': source.account, 'account_color': color_hash(source.account)}
+               for source in item.sources]
+    return {
+        'id': index,
+        'name': item.item.name,
+        'icon': item.item.icon,
+        'wiki_link': item.item.wiki_link,
+        'color': item_rarity_colors.get(item.item.rarity, '#000000'),
+        'description': item_description_html(item.item.description) if item.item.description else None,
+        'advice': item.advice,
+        'account_bound': item.item.account_bound,
+        'sources': sources,
+        'count': sum(source['count'] for source in sources),
+        'count_text': f"{sum(source['count'] for source in sources):n}",
+        'where': ' '.join(f"{source['place']}@{source['account']}" for source in sources),
+    }
+
+
+class AdviceTableUi:
+    # rows live on server, page only gets rows it shows, so it costs the same for any count of advice
+
+    def __init__(self, advices: list[ItemForDisplay]):
+        self.rows = [advice_row(index, item) for index, item in enumerate(advices)]
+        self.account: str | None = None
+        self.place: str | None = None
+        self.min_count = 0
+
+        accounts = sorted({source['account'] for row in self.rows for source in row['sources']})
+        places = sorted({source['place'] for row in self.rows for source in row['sources']})
+        with ui.row().classes('items-center'):
+            ui.select(accounts, label='Account', clearable=True,
+                      on_change=lambda e: self.set_filter(account=e.value)).classes('w-48')
+            ui.select(places, label='Place', clearable=True,
+                      on_change=lambda e: self.set_filter(place=e.value)).classes('w-48')
+            ui.number('At least', value=0, min=0, precision=0,
+                      on_change=lambda e: self.set_filter(min_count=int(e.value or 0))).classes('w-32')
+
+        self.table = ui.table(columns=advice_columns, rows=[], row_key='id',
+                              pagination={'rowsPerPage': rows_per_page, 'page': 1, 'sortBy': None,
+                                          'descending': False, 'rowsNumber': len(self.rows)})
+        self.table.classes('w-full').props('flat :rows-per-page-options="[10, 25, 50, 100]"')
+        self.table.add_slot('body', advice_row_slot)
+        self.table.on('request', self.on_request, ['pagination'])
+        self.show_page(self.table.pagination)
+
+    def set_filter(self, **changes) -> None:
+        for name, value in changes.items():
+            setattr(self, name, value)
+        self.show_page(dict(self.table.pagination, page=1))
+
+    def on_request(self, e: GenericEventArguments) -> None:
+        self.show_page(e.args['pagination'])
+
+    def filtered_rows(self) -> list[dict]:
+        if self.account is None and self.place is None and self.min_count <= 0:
+            return list(self.rows)
+        rows = []
+        for row in self.rows:
+            # row shows only sources passing filter, its count is count of those sources
+            sources = [source for source in row['sources']
+                       if (self.account is None or source['account'] == self.account)
+                       and (self.place is None or source['place'] == self.place)]
+            count = sum(source['count'] for source in sources)
+            if sources and count >= self.min_count:
+                rows.append(dict(row, sources=sources, count=count, count_text=f'{count:n}'))
+        return rows
+
+    def show_page(self, pagination: dict) -> None:
+        rows = self.filtered_rows()
+        sort_key = sort_keys.get(pagination.get('sortBy', None), None)
+        if sort_key:
+            rows.sort(key=sort_key, reverse=pagination.get('descending', False))
+        page_size = pagination.get('rowsPerPage', rows_per_page)
+        page = pagination.get('page', 1)
+        if page_size > 0:
+            page = min(page, max(1, -(-len(rows) // page_size)))
+            rows_on_page = rows[(page - 1) * page_size:page * page_size]
+        else:
+            rows_on_page = rows
+        self.table.pagination = dict(pagination, page=page, rowsNumber=len(rows))
+        self.table.rows = rows_on_page
@@ -96,7 +96,7 @@ class ApiKeysManagerUi:
                 with ui.grid(columns='auto 2fr auto auto').classes('w-full'):
                     with ui.switch().bind_value(item, 'selected').on_value_change(self.toggle_key):
                         ui.tooltip(
-                            'When getting advice, only selected accounts are searched. Multiple accounts selected can be fairly slow and will produce lots of junk results from trying to merge multiple material storages.').classes(
+                            'When getting advice, only selected accounts are searched. Multiple accounts selected will produce lots of junk results from trying to merge multiple material storages.').classes(
                             'bg-green')
 
                     ui.label(item.api_key).classes('font-medium')
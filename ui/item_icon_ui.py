@@ -1,9 +1,5 @@
 from functools import reduce
 
-from nicegui import ui
-
-from data.item import ItemForDisplay
-
 item_description_replaces = {
     '<c=@flavor>': '<i>',
     '<c>': '</i>',
@@ -11,10 +7,5 @@ item_description_replaces = {
 }
 
 
-def item_icon_ui(item: ItemForDisplay) -> None:
-    with ui.image(item.item.icon).classes('w-16 h-16 shadow-lg'):
-        if item.item.description:
-            item_description: str = reduce(lambda a, kv: a.replace(*kv), item_description_replaces.items(),
-                                           item.item.description)
-            with ui.tooltip().classes('bg-transparent'):
-                ui.html(item_description).classes('shadow-lg rounded bg-slate-800/75 p-1 max-w-md text-base')
+def item_description_html(description: str) -> str:
+    return reduce(lambda a, kv: a.replace(*kv), item_description_replaces.items(), description)
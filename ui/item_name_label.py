@@ -1,7 +1,3 @@
-from nicegui import ui
-
-from data.item import Item
-
 item_rarity_colors = {
     'Junk': '#AAAAAA',
     'Basic': '#000000',
@@ -12,10 +8,3 @@ item_rarity_colors = {
     'Ascended': '#fb3e8d',
     'Legendary': '#4C139D'
 }
-
-
-def item_name_label_ui(item: Item) -> None:
-    color = item_rarity_colors.get(item.rarity, '#000000')
-
-    ui.link(item.name, item.wiki_link, new_tab=True).style(
-        f'color: {color}; font-weight: bold')
@@ -0,0 +1,51 @@
+from nicegui import ui
+
+from data.load_report import LoadReport
+
+stage_columns = [
+    {'name': 'name', 'label': 'Stage', 'field': 'name', 'align': 'left'},
+    {'name': 'started', 'label': 'Started (s)', 'field': 'started', 'sortable': True},
+    {'name': 'wall', 'label': 'Wall (s)', 'field': 'wall', 'sortable': True},
+    {'name': 'cpu', 'label': 'CPU (s)', 'field': 'cpu', 'sortable': True},
+]
+
+endpoint_columns = [
+    {'name': 'endpoint', 'label': 'Endpoint', 'field': 'endpoint', 'align': 'left'},
+    {'name': 'requests', 'label': 'Requests', 'field': 'requests', 'sortable': True},
+    {'name': 'bytes', 'label': 'Bytes', 'field': 'bytes', 'sortable': True},
+    {'name': 'retries', 'label': 'Retries', 'field': 'retries', 'sortable': True},
+    {'name': 'errors', 'label': 'Errors', 'field': 'errors', 'sortable': True},
+    {'name': 'p50', 'label': 'p50 (ms)', 'field': 'p50', 'sortable': True},
+    {'name': 'p90', 'label': 'p90 (ms)', 'field': 'p90', 'sortable': True},
+    {'name': 'p99', 'label': 'p99 (ms)', 'field': 'p99', 'sortable': True},
+]
+
+cache_columns = [
+    {'name': 'kind', 'label': 'Cache', 'field': 'kind', 'align': 'left'},
+    {'name': 'hits', 'label': 'Hits', 'field': 'hits', 'sortable': True},
+    {'name': 'misses', 'label': 'Misses', 'field': 'misses', 'sortable': True},
+]
+
+
+def load_report_ui(report: LoadReport) -> None:
+    stage_rows = [{'name': stage.name, 'started': round(stage.started, 3), 'wall': round(stage.wall, 3),
+                   'cpu': round(stage.cpu, 3)} for stage in sorted(report.stages, key=lambda stage: stage.started)]
+    endpoint_rows = []
+    for name, endpoint in report.requests.get('endpoints', dict()).items():
+        latency = endpoint.get('latency_ms', dict())
+        endpoint_rows.append({'endpoint': name, 'requests': endpoint['requests'], 'bytes': endpoint['bytes'],
+                              'retries': endpoint['retries'], 'errors': endpoint['errors'],
+                              'p50': latency.get('p50', 0), 'p90': latency.get('p90', 0),
+                              'p99': latency.get('p99', 0)})
+    cache_rows = [{'kind': kind, 'hits': cache['hits'], 'misses': cache['misses']}
+                  for kind, cache in report.requests.get('cache', dict()).items()]
+
+    with ui.dialog() as dialog, ui.card().classes('w-full max-w-5xl'):
+        ui.label(report.summary()[0]).classes('text-lg font-medium')
+        ui.table(columns=stage_columns, rows=stage_rows, row_key='name').props('dense flat').classes('w-full')
+        ui.table(columns=endpoint_columns, rows=endpoint_rows, row_key='endpoint').props('dense flat').classes(
+            'w-full')
+        ui.table(columns=cache_columns, rows=cache_rows, row_key='kind').props('dense flat').classes('w-full')
+        ui.button('Close', on_click=dialog.close)
+    dialog.on('hide', dialog.delete)
+    dialog.open()
@@ -0,0 +1,50 @@
+import threading
+from typing import Any, Callable
+
+from nicegui import Client, core
+
+# burst of items put within this many seconds is shown at once
+batch_delay = 0.05
+
+
+class PushQueue:
+    # items put from loading threads are pushed to page when they come, page is not polled
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending: list[Any] = []
+        self.scheduled = False
+        self.client: Client | None = None
+        self.handler: Callable[[list[Any]], None] | None = None
+
+    def connect(self, client: Client, handler: Callable[[list[Any]], None]) -> None:
+        # called in page, items put before page was shown are delivered now
+        with self.lock:
+            self.client = client
+            self.handler = handler
+            self.scheduled = False
+        self.wake()
+
+    def put(self, item: Any) -> None:
+        with self.lock:
+            self.pending.append(item)
+        self.wake()
+
+    def wake(self) -> None:
+        with self.lock:
+            if self.scheduled or not self.pending or self.client is None or core.loop is None:
+                return
+            self.scheduled = True
+        core.loop.call_soon_threadsafe(core.loop.call_later, batch_delay, self.deliver)
+
+    def deliver(self) -> None:
+        with self.lock:
+            items = self.pending
+            self.pending = []
+            self.scheduled = False
+            client = self.client
+            handler = self.handler
+        if not items or client is None or client._deleted:
+            return
+        with client:
+            handler(items)
@@ -1,10 +1,10 @@
 import json
 import os.path
 from dataclasses import dataclass, field
-from queue import Queue
 from typing import List, Callable
 
 from messaging.messaging import Listener, Messaging
+from ui.push_queue import PushQueue
 
 from log_config import logger
 
@@ -52,7 +52,10 @@ class UiModel(Listener):
 
     def __init__(self):
         self.api_keys = ApiKeyList()
-        self.queue = Queue()
+        # messages and progress for page
+        self.queue = PushQueue()
+        # advice panels with newly published advice, waiting for refresh
+        self.ready_advice = PushQueue()
         self.model = None
         self.model_messaging = Messaging()
 